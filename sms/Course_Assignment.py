@@ -1,65 +1,14 @@
 import streamlit as st
-import calendar
 from datetime import datetime
-import pandas as pd
-import numpy as np
 from streamlit_option_menu import option_menu
-import pickle
-from pathlib import Path
-import streamlit_authenticator as stauth
-from streamlit_pandas_profiling import st_profile_report
-import sqlite3
-import plotly.express as px
-import re
+import db
+import student_search
+import refdata
+from services import enrollment
 
 
-conn = sqlite3.connect('../studentmonitor.db', check_same_thread=False)
-cur = conn.cursor()
-
 def app():
-    def addCourseAssignment(StudentID, CourseCode, Grade, FinalGrade, GradeStatus, AcademicYear, YearLevel, Semester):
-        cur.execute(
-            """CREATE TABLE IF NOT EXISTS courseassignment (
-                EnrollID INTEGER PRIMARY KEY AUTOINCREMENT,
-                StudentID TEXT NOT NULL,
-                CourseCode TEXT NOT NULL,
-                Grade TEXT,
-                FinalGrade TEXT,
-                GradeStatus TEXT,
-                AcademicYear TEXT,
-                YearLevel TEXT,
-                Semester TEXT,
-                FOREIGN KEY(StudentID) REFERENCES student(StudentID),
-                FOREIGN KEY(CourseCode) REFERENCES prospectus(CourseCode)
-            )"""
-        )
-        cur.execute(
-            "SELECT * FROM courseassignment WHERE StudentID = ? AND CourseCode = ? AND AcademicYear = ? AND YearLevel = ? AND Semester = ?",
-            (StudentID, CourseCode, AcademicYear, YearLevel, Semester)
-        )
-        if cur.fetchone() is None:
-            cur.execute(
-                "INSERT INTO courseassignment (StudentID, CourseCode, Grade, FinalGrade, GradeStatus, AcademicYear, YearLevel, Semester) VALUES (?,?,?,?,?,?,?,?)",
-                (StudentID, CourseCode, Grade, FinalGrade, GradeStatus, AcademicYear, YearLevel, Semester)
-            )
-            conn.commit()
-            return True
-        return False
-
-    # Function to delete course assignment
-    def deleteCourseAssignment(StudentID, CourseCode):
-        cur.execute("DELETE FROM courseassignment WHERE StudentID = ? AND CourseCode = ?", (StudentID, CourseCode))
-        conn.commit()
-
-    # Function to update course assignment
-    def updateCourseAssignment(StudentID, CourseCode, YearLevel, Semester):
-        cur.execute(
-            """UPDATE courseassignment 
-            SET YearLevel = ?,Semester = ?
-            WHERE StudentID = ? AND CourseCode = ?""",
-            (YearLevel, Semester, StudentID, CourseCode)
-        )
-        conn.commit()
+    conn = db.get_connection()
 
     if 'operation_success' not in st.session_state:
         st.session_state.operation_success = None
@@ -72,21 +21,12 @@ def app():
     #year_levels.sort(reverse=True)  # Sort years in decreasing order
     #status_options = ["taken", "not taken"]
 
-    # Fetching student IDs and names
-    cur.execute("SELECT StudentID, Name FROM student")
-    students = cur.fetchall()
-    student_ids = [student[0] for student in students]
-    student_names = {student[0]: student[1] for student in students}  # Dictionary for mapping StudentID to StudentName
-
     # Generate list of school years
     current_year = datetime.today().year
     school_year = [f"{current_year-1}-{current_year}", f"{current_year}-{current_year+1}", f"{current_year+1}-{current_year+2}"]
 
-    # Fetching course codes (assuming course codes are present in the 'prospectus' table)
-    cur.execute("SELECT CourseCode, CourseDesc FROM prospectus")
-    courses = cur.fetchall()
-    course_codes = [course[0] for course in courses]
-    course_descriptions = {course[0]: course[1] for course in courses}  # Dictionary for mapping CourseCode to CourseDescription
+    # Course codes and descriptions, shared across sessions until the prospectus changes
+    courses = refdata.courses()
 
     # Main Navigation
     selected = option_menu(
@@ -108,6 +48,9 @@ def app():
         if sub_selected == "Assign Course":
             st.header("Assign Course")
 
+            # Search box for students; outside the form so matches update while typing
+            selected_student_id, selected_student_name = student_search.student_picker("Select Student:", key="assign_course_student")
+
             with st.form("Assign Course", clear_on_submit=True):
                 acad_year = st.selectbox("Select Academic Year:", school_year)
 
@@ -116,56 +59,25 @@ def app():
                 selected_semester = col2.selectbox("Select Semester:", semesters, key="sem")
 
                 "---"
-                selected_student_name = st.selectbox("Select Student:", list(student_names.values()))
-                selected_student_id = next(key for key, value in student_names.items() if value == selected_student_name)
-                
-                selected_course_descriptions = st.multiselect("Enrolled Courses", list(course_descriptions.values()))
-                selected_course_codes = [key for key, value in course_descriptions.items() if value in selected_course_descriptions]
+                selected_course_codes = st.multiselect("Enrolled Courses", list(courses), format_func=courses.name)
                 
 
                 "---"
                 submit = st.form_submit_button("Assign")
 
-                if submit:
-                    success_count = 0                    
+                if submit and not selected_student_id:
+                    st.warning("Please select a student.")
+                elif submit:
+                    result = enrollment.assign_courses(selected_student_id, selected_course_codes, acad_year, selected_year, selected_semester)
+                    success_count = len(result.assigned)
                     error_messages = []
-                
-                    for selected_course_code in selected_course_codes:
-                        
-                        # Check for prerequisites and corequisites
-                        cur.execute("SELECT Prerequisite, Corequisite FROM requisite WHERE CourseCode = ?", (selected_course_code,))
-                        requisite = cur.fetchone()
-                        prereq_met = True
-                        coreq_met = True
-
-                        if requisite:
-                            prereq, coreq = requisite
-
-                            # Check prerequisites
-                            if prereq:
-                                prereq_courses = prereq.split(', ')
-                                for prereq_course in prereq_courses:
-                                    cur.execute(
-                                        "SELECT * FROM courseassignment WHERE StudentID = ? AND CourseCode = ? ",
-                                        (selected_student_id, prereq_course)
-                                    )
-                                    if cur.fetchone() is None:
-                                        prereq_met = False
-                                        error_messages.append(f"Prerequisite {prereq_course} not taken.")
-
-                            # Check corequisites
-                            if coreq:
-                                coreq_courses = coreq.split(', ')
-                                if not any(course in selected_course_codes  for course in coreq_courses):
-                                    coreq_met = False
-                                    error_messages.append(f"Corequisite {', '.join(coreq_courses)} not selected.")
-
-                        if prereq_met and coreq_met:
-                            success = addCourseAssignment(selected_student_id, selected_course_code, None, None, None, acad_year, selected_year, selected_semester)
-                            if success:
-                                success_count += 1
-                        else:
-                            error_messages.append(f"Cannot assign {selected_course_code} due to prerequisite/corequisite issues.")
+                    for check in result.checks:
+                        for prereq_course in check.missing_prerequisites:
+                            error_messages.append(f"Prerequisite {prereq_course} not taken.")
+                        if check.missing_corequisites:
+                            error_messages.append(f"Corequisite {', '.join(check.missing_corequisites)} not selected.")
+                        if not check.ok:
+                            error_messages.append(f"Cannot assign {check.course_code} due to prerequisite/corequisite issues.")
 
                     if success_count > 0:
                         st.success(f'{success_count} course assignment(s) have been successful')
@@ -175,34 +87,20 @@ def app():
 
         elif sub_selected == "Manage Assignments":
             st.header("Manage Course Assignments")
-            assignments = pd.read_sql_query(
-                "SELECT ca.StudentID, ca.CourseCode, ca.Semester, ca.YearLevel, ca.AcademicYear "
-                "FROM courseassignment ca "
-                "ORDER BY ca.YearLevel DESC, ca.Semester", conn)
-
-            # Fetch course descriptions
-            courses = pd.read_sql_query(
-                "SELECT p.CourseCode, p.CourseDesc "
-                "FROM prospectus p", conn)
-            
-            # Create a mapping from CourseCode to CourseDescription
-            course_mapping = dict(zip(courses['CourseCode'], courses['CourseDesc']))
-            inverse_course_mapping = {v: k for k, v in course_mapping.items()}
 
-            selected_student_name = st.selectbox("Select Student:", list(student_names.values()))
-            selected_student_id = next(key for key, value in student_names.items() if value == selected_student_name)
-            
-            # Fetch the assignments for the selected student
-            student_assignments = assignments[assignments['StudentID'] == selected_student_id]
+            selected_student_id, selected_student_name = student_search.student_picker("Select Student:", key="manage_assignment_student")
+
+            # Fetch the assignments for the selected student only, with their course descriptions
+            student_assignments = enrollment.student_assignments(conn, selected_student_id)
             
             if student_assignments.empty:
                 st.warning("No 'taken' course assignments found for the selected student.")
             else:
                 # Map course codes to course descriptions for the select box
-                student_assignments['CourseDesc'] = student_assignments['CourseCode'].map(course_mapping)
-                
-                selected_course_update = st.selectbox("Select Course Assigned:", student_assignments['CourseDesc'].unique())
-                selected_course_code = inverse_course_mapping[selected_course_update]
+                course_mapping = dict(zip(student_assignments['CourseCode'], student_assignments['CourseDesc'].fillna(student_assignments['CourseCode'])))
+
+                selected_course_code = st.selectbox("Select Course Assigned:", list(course_mapping), format_func=course_mapping.get)
+                selected_course_update = course_mapping[selected_course_code]
 
                 st.subheader("Update and Delete Course Assignment")
                 with st.form("Update and Delete Course Assignment", clear_on_submit=True):
@@ -217,7 +115,7 @@ def app():
                         update = st.form_submit_button("Update")
                         if update:
                             if all([selected_student_id, selected_course_code, selected_year_update, selected_semester_update]):
-                                updateCourseAssignment(selected_student_id, selected_course_code, selected_year_update, selected_semester_update)
+                                enrollment.update_assignment(selected_student_id, selected_course_code, selected_year_update, selected_semester_update)
                                 st.session_state.operation_success = "Data updated successfully."
                                 st.experimental_rerun()
                             else:
@@ -232,7 +130,7 @@ def app():
                                 def confirm_deletioncourse_dialog():
                                     st.write(f"Are you sure you want to delete this course assignment? {selected_student_id} - {selected_course_update}")
                                     if st.button("Yes"):
-                                        deleteCourseAssignment(selected_student_id, selected_course_code)
+                                        enrollment.delete_assignment(selected_student_id, selected_course_code)
                                         st.session_state.operation_success = "Course Assignment deleted successfully."
                                         st.experimental_dialog()
                                         st.experimental_rerun()
@@ -249,31 +147,23 @@ def app():
 
     # Course Directory Page
     elif selected == "Course Directory":
+        # Plotly is heavy to import, so it is loaded only by the page that draws charts
+        import plotly.express as px
+
         st.header("Search by Student")
 
-        student_names_list = [""] + list(student_names.values())  # Add a blank option
-        selected_student_name = st.selectbox("Select Student:", student_names_list)
+        selected_student_id, selected_student_name = student_search.student_picker("Select Student:", key="directory_student", allow_blank=True)
 
         if selected_student_name:
-            selected_student_id = next(key for key, value in student_names.items() if value == selected_student_name)
             st.write(f"Selected Student: {selected_student_name}")
 
-            # Calculate fixed_total_units from the sum of units in the prospectus table
-            fixed_total_units_df = pd.read_sql_query(
-                "SELECT SUM(Units) as TotalUnits FROM prospectus", 
-                conn
-            )
-            fixed_total_units = fixed_total_units_df['TotalUnits'].iloc[0]
-
-            total_units_df = pd.read_sql_query(
-                "SELECT ca.StudentID, ca.CourseCode, p.CourseDesc, p.Units "
-                "FROM courseassignment ca "
-                "JOIN prospectus p ON ca.CourseCode = p.CourseCode "
-                "WHERE ca.StudentID = ?",  # Only count courses for the selected student
-                conn, params=(selected_student_id,)
-            )
-            if not total_units_df.empty:
-                total_units = total_units_df['Units'].sum()
+            # Units of the whole curriculum, from the prospectus table
+            fixed_total_units = enrollment.curriculum_units(conn)
+
+            # The selected student's courses, read once for both the unit totals and the term tables
+            df = enrollment.student_courses(conn, selected_student_id)
+            if not df.empty:
+                total_units = df['Units'].sum()
                 # Data for the pie chart
                 data = {
                     'Category': ['Units Taken', 'Units Remaining'],
@@ -290,20 +180,12 @@ def app():
             else:
                 st.warning("No course assignments found for the selected student.")
 
-            df = pd.read_sql_query(
-                "SELECT ca.StudentID, ca.CourseCode, p.CourseDesc, ca.Semester, ca.YearLevel, p.Units "
-                "FROM courseassignment ca "
-                "JOIN prospectus p ON ca.CourseCode = p.CourseCode "
-                "WHERE ca.StudentID = ? "
-                "ORDER BY ca.YearLevel DESC, ca.Semester DESC", 
-                conn, params=(selected_student_id,)
-            )
-
             if not df.empty:
+                terms = df.groupby(['YearLevel', 'Semester'])
                 for year in year_levels:
                     for sem in semesters:
-                        filtered_df = df[(df['YearLevel'] == year) & (df['Semester'] == sem)]
-                        if not filtered_df.empty:
+                        if (year, sem) in terms.groups:
+                            filtered_df = terms.get_group((year, sem))
                             st.write(f"{year} YearLevel - {sem}")
                             # Drop the columns StudentID, YearLevel, and Semester before displaying
                             display_df = filtered_df.drop(columns=['StudentID', 'YearLevel', 'Semester'])
@@ -311,13 +193,7 @@ def app():
         else:
             st.header("Course Count by Semester and Year Level")
 
-            count_df = pd.read_sql_query(
-                "SELECT AcademicYear, Semester, CourseCode, COUNT(*) as Count "
-                "FROM courseassignment "
-                "WHERE AcademicYear IS NOT NULL "
-                "GROUP BY AcademicYear, Semester, CourseCode", 
-                conn
-            )
+            count_df = enrollment.course_counts(conn)
 
             # Get unique combinations of AcademicYear and Semester
             unique_combinations = count_df[['AcademicYear', 'Semester']].drop_duplicates()
@@ -0,0 +1,31 @@
+import streamlit as st
+import io
+import db
+import export
+
+
+def app():
+    st.header("Export Data")
+    st.write("Download registrar tables for other offices. Files are built only when you ask for them; "
+             "for nightly dumps use `python export.py`.")
+
+    formats = ["csv"] + (["parquet"] if export.parquet_available() else [])
+    titles = {item.name: item.title for item in export.EXPORTS}
+
+    col1, col2 = st.columns(2)
+    name = col1.selectbox("Data", list(titles), format_func=titles.get)
+    # Parquet is offered only when pyarrow is installed, and is still experimental
+    fmt = col2.selectbox("Format", formats, format_func=lambda fmt: "PARQUET (experimental)" if fmt == "parquet" else fmt.upper())
+
+    if st.button("Prepare File"):
+        # The file is held in memory for the download; the CLI writes straight to disk
+        buffer = io.BytesIO()
+        with st.spinner("Exporting..."), export.snapshot(db.get_connection()) as conn:
+            rows = export.write(conn, name, fmt, buffer)
+        st.success(f"{rows} row(s) exported.")
+        st.download_button(
+            label=f"Download {titles[name]} as {fmt.upper()}",
+            data=buffer.getvalue(),
+            file_name=f"{name}.{fmt}",
+            mime=export.FORMATS[fmt],
+        )
@@ -1,16 +1,4 @@
 import streamlit as st
-import calendar
-from datetime import datetime
-import pandas as pd
-import numpy as np
-from streamlit_option_menu import option_menu
-import pickle
-from pathlib import Path
-import streamlit_authenticator as stauth
-from streamlit_pandas_profiling import st_profile_report
-import sqlite3
-import plotly.express as px
-import re
 
 
 def app():
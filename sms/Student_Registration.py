@@ -1,80 +1,13 @@
 import streamlit as st
-import calendar
-from datetime import datetime
-import pandas as pd
-import numpy as np
 from streamlit_option_menu import option_menu
-import pickle
-from pathlib import Path
-import streamlit_authenticator as stauth
-from streamlit_pandas_profiling import st_profile_report
-import sqlite3
-import plotly.express as px
-import re
+import db
+import student_search
+import student_import
+from services import students
 
-conn = sqlite3.connect('../studentmonitor.db', check_same_thread=False)
-cur = conn.cursor()
 
 def app():
-    def createStudent():
-        cur.execute(
-            """CREATE TABLE IF NOT EXISTS student (
-            StudentID TEXT NOT NULL UNIQUE,
-            Name TEXT NOT NULL,
-            BirthDate TEXT NOT NULL,
-            Sex TEXT NOT NULL,
-            Gender TEXT NOT NULL,
-            Religion TEXT NOT NULL,
-            Address TEXT NOT NULL,
-            Track TEXT NOT NULL,
-            Program TEXT NOT NULL,
-            ContactNumber TEXT NOT NULL,
-            PRIMARY KEY(StudentID))"""
-        )
-        conn.commit()
-
-    # Function definitions
-    def addStudent(StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber):
-        # Check if StudentID already exists
-        cur.execute("SELECT StudentID FROM student WHERE StudentID=?", (StudentID,))
-        if cur.fetchone():
-            st.warning("A student with this ID already exists.")
-            return False
-        cur.execute(
-            "INSERT INTO student (StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber) VALUES (?,?,?,?,?,?,?,?,?,?)",
-            (StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber))
-        conn.commit()
-        return True
-
-    def updateStudent(StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber):
-        cur.execute("SELECT StudentID FROM student WHERE StudentID=?", (StudentID,))
-        if cur.fetchone() is None:
-            st.warning("Student ID not found.")
-            return False
-        cur.execute(
-            "UPDATE student SET Name=?, BirthDate=?, Sex=?, Gender=?, Religion=?, Address=?, Track=?, Program=?, ContactNumber=? WHERE StudentID=?",
-            (Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber, StudentID))
-        conn.commit()
-        return True
-
-    def deleteStudent(StudentID):
-        cur.execute("SELECT StudentID FROM student WHERE StudentID=?", (StudentID,))
-        if cur.fetchone() is None:
-            st.warning("Student ID not found.")
-            return False
-        cur.execute("DELETE FROM student WHERE StudentID=?", (StudentID,))
-        conn.commit()
-        return True
-
-    def get_students_by_semester_year(semester, year_level):
-        cur.execute("SELECT * FROM academicrecords WHERE Semester=? AND YearLevel=?", (semester, year_level))
-        return cur.fetchall()
-
-
-    def get_student_details(StudentID):
-        cur.execute("SELECT * FROM student WHERE StudentID=?", (StudentID,))
-        return cur.fetchone()
-        
+    conn = db.get_connection()
 
     # Set up session state to store operation success
     if 'operation_success' not in st.session_state:
@@ -91,13 +24,15 @@ def app():
     sex_list = ["Female", "Male"]
     gender_list = ["Female", "Male", "LGBTQIA+"]
     program_list = ["BS Statistics", "BS Mathematics"]
+    semester_list = ["1st Term", "2nd Term", "Summer Term"]
+    scholastic_status_list = ["Regular", "Irregular"]
     track_list = ["Science, Technology, Engineering, and Mathematics (STEM)", "Accountancy, Business and Management (ABM)", "Humanities and Social Sciences (HUMSS)", "General Academic Strand (GAS)", "Technical-Vocational-Livelihood (TVL)"]
 
     # Navigation
     selected = option_menu(
         menu_title=None,
-        options=["Student Registration", "Academic Records", "Student Directory"],
-        icons=["person-circle", "folder-fill"],
+        options=["Student Registration", "Import Students", "Academic Records", "Student Directory"],
+        icons=["person-circle", "upload", "folder-fill"],
         orientation="horizontal",
     )
     if selected == "Student Registration":
@@ -108,41 +43,32 @@ def app():
         # Student Registration
         st.header("Demographics")
 
-        # Fetch all students for selection
-        cur.execute("SELECT StudentID, Name FROM student")
-        students = cur.fetchall()
-        # Sort students alphabetically based on the last word of their name
-        sorted_students = sorted(students, key=lambda x: x[1].split()[-1])
-
-        # Create a dictionary for mapping student name to ID
-        student_dict = {name: sid for sid, name in sorted_students}
-
-        # Selection box for existing students
-        selected_student_name = st.selectbox("Select Student to Update", options=[""] + list(student_dict.keys()))
-        student_details = get_student_details(student_dict[selected_student_name]) if selected_student_name else None
+        # Search box for existing students
+        selected_student_id, selected_student_name = student_search.student_picker("Select Student to Update", key="update_student", allow_blank=True)
+        student_details = students.get_student(conn, selected_student_id) if selected_student_id else None
 
         with st.form("entry_form", clear_on_submit=True):
-            idnum = st.text_input("ID Number", placeholder="####-####", value=student_details[0] if student_details else "")
-            name = st.text_input("Name", placeholder="Sana Minatozaki", value=student_details[1] if student_details else "")
-            BirthDate = st.text_input("BirthDate", placeholder="August 7, 2002", value=student_details[2] if student_details else "")
+            idnum = st.text_input("ID Number", placeholder="####-####", value=student_details.StudentID if student_details else "")
+            name = st.text_input("Name", placeholder="Sana Minatozaki", value=student_details.Name if student_details else "")
+            BirthDate = st.text_input("BirthDate", placeholder="August 7, 2002", value=student_details.BirthDate if student_details else "")
 
             col1, col2, col3 = st.columns(3)
-            sex = col1.selectbox("Sex", sex_list, index=sex_list.index(student_details[3]) if student_details else 0)
-            gender = col2.selectbox("Gender", gender_list, index=gender_list.index(student_details[4]) if student_details else 0)
-            religion = col3.selectbox("Religious Affiliation", religion_list, index=religion_list.index(student_details[5]) if student_details else 0)
+            sex = col1.selectbox("Sex", sex_list, index=sex_list.index(student_details.Sex) if student_details else 0)
+            gender = col2.selectbox("Gender", gender_list, index=gender_list.index(student_details.Gender) if student_details else 0)
+            religion = col3.selectbox("Religious Affiliation", religion_list, index=religion_list.index(student_details.Religion) if student_details else 0)
 
-            address = student_details[6].split(",") if student_details else ["", "", "", ""]
+            address = student_details.Address.split(",") if student_details else ["", "", "", ""]
             region = st.selectbox("Region", region_list, index=region_list.index(address[0]) if student_details else 0)
             province = st.text_input("Province", placeholder="Lanao del Norte", value=address[1] if student_details else "")
             city = st.text_input("City", placeholder="Iligan", value=address[2] if student_details else "")
             barangay = st.text_input("Barangay", placeholder="Tibanga", value=address[3] if student_details else "")
 
-            track = st.selectbox("Academic Track/Strand", track_list, index=track_list.index(student_details[7]) if student_details else 0)
+            track = st.selectbox("Academic Track/Strand", track_list, index=track_list.index(student_details.Track) if student_details else 0)
 
             col1, col2= st.columns(2)
-            prog = col1.selectbox("Program", program_list, index=program_list.index(student_details[8]) if student_details else 0)
+            prog = col1.selectbox("Program", program_list, index=program_list.index(student_details.Program) if student_details else 0)
             with col2:
-                number = st.text_input("Phone Number", placeholder="09#########", value=student_details[9] if student_details else "")
+                number = st.text_input("Phone Number", placeholder="09#########", value=student_details.ContactNumber if student_details else "")
 
             "---"
 
@@ -151,8 +77,10 @@ def app():
                 submitted = st.form_submit_button("Register")
                 if submitted:
                     if all([idnum, name, BirthDate, sex, gender, religion, region, province, city, barangay, track, prog, number]):
-                        success = addStudent(idnum, name, BirthDate, sex, gender, religion, region + "," + province + "," + city + "," + barangay, track, prog, number)
-                        if success:
+                        success = students.add_student(students.Student(idnum, name, BirthDate, sex, gender, religion, region + "," + province + "," + city + "," + barangay, track, prog, number))
+                        if not success:
+                            st.warning("A student with this ID already exists.")
+                        else:
                             st.session_state.operation_success = "Student registered successfully."
                             st.rerun()
                     else:
@@ -162,8 +90,10 @@ def app():
                 updated = st.form_submit_button("Update")
                 if updated and student_details:
                     if all([idnum, name, BirthDate, sex, gender, religion, region, province, city, barangay, track, prog, number]):
-                        success = updateStudent(idnum, name, BirthDate, sex, gender, religion, region + "," + province + "," + city + "," + barangay, track, prog, number)
-                        if success:
+                        success = students.update_student(students.Student(idnum, name, BirthDate, sex, gender, religion, region + "," + province + "," + city + "," + barangay, track, prog, number))
+                        if not success:
+                            st.warning("Student ID not found.")
+                        else:
                             st.session_state.operation_success = "Student updated successfully."
                             st.rerun()
                     else:
@@ -177,8 +107,8 @@ def app():
                         def confirm_deletion_dialog():
                             st.write(f"Are you sure you want to delete the student: {selected_student_name}?")
                             if st.button("Yes"):
-                                deleteStudent(idnum)
-                                st.session_state.operation_success = f"Student {selected_student_name} deleted successfully."
+                                if students.delete_student(idnum):
+                                    st.session_state.operation_success = f"Student {selected_student_name} deleted successfully."
                                 st.experimental_rerun()
                             elif st.button("No"):
                                 st.experimental_rerun()
@@ -196,83 +126,6 @@ def app():
                         
 # --------------------------------------------------------- #
     elif selected == "Academic Records":
-        # Function to create academic records
-        def createAcademicRecords(StudentID, YearLevel, Semester, ScholasticStatus, ScholarshipStatus):
-            # Create the academicrecords table if it doesn't exist
-            cur.execute(
-                """CREATE TABLE IF NOT EXISTS academicrecords (
-                RecordID INTEGER PRIMARY KEY AUTOINCREMENT,
-                StudentID TEXT NOT NULL,
-                ScholasticStatus TEXT NOT NULL,
-                ScholarshipStatus TEXT,
-                YearLevel INTEGER NOT NULL,
-                Semester TEXT NOT NULL,
-                UNIQUE(StudentID, YearLevel, Semester),
-                FOREIGN KEY(StudentID) REFERENCES student(StudentID)
-                )"""
-            )
-            
-            # Check if the record already exists for the given StudentID
-            cur.execute(
-                "SELECT * FROM academicrecords WHERE StudentID = ? AND YearLevel = ? AND Semester = ?",
-                (StudentID, YearLevel, Semester)
-            )
-            if cur.fetchone() is None:
-                # If no record exists, insert the new academic record
-                cur.execute(
-                    "INSERT INTO academicrecords (StudentID, ScholasticStatus, ScholarshipStatus, YearLevel, Semester) VALUES (?, ?, ?, ?, ?)",
-                    (StudentID, ScholasticStatus, ScholarshipStatus, YearLevel, Semester)
-                )
-                conn.commit()
-                return True
-            return False
-        
-        # Function to delete academic record
-        def deleteAcademicRecords(StudentID):
-            try:
-                # Adjust your SQL DELETE query based on your database schema
-                cur.execute("DELETE FROM academicrecords WHERE StudentID=?", (StudentID,))
-                conn.commit()
-                return True
-            except Exception as e:
-                st.error(f"Failed to delete academic records: {str(e)}")
-                conn.rollback()
-                return False
-
-
-        def get_academic_record_details(StudentID):
-            cur.execute("SELECT * FROM academicrecords WHERE StudentID=?", (StudentID,))
-            return cur.fetchone()
-            
-
-        # Function to update academic record
-        def updateAcademicRecords(StudentID, YearLevel, Semester, ScholasticStatus, ScholarshipStatus):
-            try:
-                # Check if the academic record exists for the given student, year level, and semester
-                cur.execute("SELECT StudentID FROM academicrecords WHERE StudentID=? AND YearLevel=? AND Semester=?",
-                            (StudentID, YearLevel, Semester))
-                if cur.fetchone() is None:
-                    st.warning("Academic record not found for the student, year level, and semester.")
-                    return False
-                
-                # Update the academic record
-                cur.execute(
-                    """UPDATE academicrecords 
-                    SET ScholasticStatus=?, ScholarshipStatus=?
-                    WHERE StudentID=? AND YearLevel=? AND Semester=?""",
-                    (ScholasticStatus, ScholarshipStatus, StudentID, YearLevel, Semester)
-                )
-                
-                conn.commit()                    
-                return True  # Return True to indicate success
-                
-            except Exception as e:
-                # Handle any exceptions (e.g., SQL errors, database connection issues)
-                print(f"Error updating academic records: {str(e)}")
-                conn.rollback()  # Rollback changes if an error occurs
-                return False
-
-
         if 'operation_success' not in st.session_state:
             st.session_state.operation_success = None
         if 'delete_confirmation' not in st.session_state:
@@ -283,12 +136,6 @@ def app():
         year_level = ["1", "2", "3", "4"]
         semester = ["1st Term", "2nd Term", "Summer Term"]
 
-        # Fetching student IDs and names
-        cur.execute("SELECT StudentID, Name FROM student")
-        students = cur.fetchall()
-        student_ids = [student[0] for student in students]
-        student_names = {student[0]: student[1] for student in students}  # Dictionary for mapping StudentID to StudentName
-
         # Academic Record Page
         if selected == "Academic Records":
             sub_selected = option_menu(
@@ -301,17 +148,10 @@ def app():
             if sub_selected == "Assign":
                 st.header("Assign")
                 
-                # Fetch all students for selection
-                cur.execute("SELECT StudentID, Name FROM student")
-                students = cur.fetchall()
-                # Sort students alphabetically based on the last word of their name
-                sorted_students = sorted(students, key=lambda x: x[1].split()[-1])
-                student_dict = {name: sid for sid, name in sorted_students}
-
-            
+                # Search box for students; outside the form so matches update while typing
+                student_id, selected_student_name = student_search.student_picker("Select Student", key="assign_student", allow_blank=True)
+
                 with st.form("Assign", clear_on_submit=True):
-                    selected_student_name = st.selectbox("Select Student", options=[""] + list(student_dict.keys()))
-                    "---"
                     col1, col2 = st.columns(2)
                     selected_year = col1.selectbox("Select Year Level:", year_level, key="year")
                     selected_semester = col2.selectbox("Select Semester:", semester, key="sem")
@@ -327,8 +167,7 @@ def app():
                     if submitted:
                         success_count = 0
                         if all([selected_student_name, selected_year, selected_semester, scholastic_status, scholarship]):
-                            student_id = student_dict[selected_student_name]
-                            success = createAcademicRecords(student_id, selected_year, selected_semester, scholastic_status, scholarship)
+                            success = students.add_academic_record(students.AcademicRecord(student_id, int(selected_year), selected_semester, scholastic_status, scholarship))
                             if success:
                                 success_count += 1
                             if success_count > 0:
@@ -341,29 +180,14 @@ def app():
             elif sub_selected == "Manage":
                 st.header("Manage Academic Records")
 
-                # Fetching student IDs and names
-                cur.execute("SELECT StudentID, Name FROM student")
-                students = cur.fetchall()
-                # Sort students alphabetically based on the last word of their name
-                sorted_students = sorted(students, key=lambda x: x[1].split()[-1])
-                student_dict = {name: sid for sid, name in sorted_students}
-
-                # Selection box for existing students
-                selected_student_name = st.selectbox("Select Student to Update", options=[""] + list(student_dict.keys()))
+                # Search box for existing students
+                selected_student_id, selected_student_name = student_search.student_picker("Select Student to Update", key="manage_student", allow_blank=True)
                 selected_year_level = None
                 selected_semester = None
 
                 if selected_student_name:
-                    selected_student_id = student_dict[selected_student_name]
-
                     # Fetch year levels and semesters for the selected student
-                    cur.execute("""
-                        SELECT DISTINCT ar.YearLevel, ar.Semester 
-                        FROM academicrecords ar 
-                        WHERE ar.StudentID = ? 
-                        ORDER BY ar.YearLevel, ar.Semester
-                    """, (selected_student_id,))
-                    levels_and_semesters = cur.fetchall()
+                    levels_and_semesters = students.academic_terms(conn, selected_student_id)
 
                     if not levels_and_semesters:
                         st.warning(f"No academic records found for {selected_student_name}.")
@@ -379,19 +203,11 @@ def app():
                 scholarship_value = ""
 
                 if selected_student_name and selected_year_level and selected_semester:
-                    selected_student_id = student_dict[selected_student_name]
-
                     # Fetch the academic record for the selected student, year level, and semester
-                    cur.execute("""
-                        SELECT ar.ScholasticStatus, ar.ScholarshipStatus 
-                        FROM academicrecords ar 
-                        WHERE ar.StudentID = ? AND ar.YearLevel = ? AND ar.Semester = ?
-                    """, (selected_student_id, selected_year_level, selected_semester))
-
-                    record = cur.fetchone()
+                    record = students.get_academic_record(conn, selected_student_id, selected_year_level, selected_semester)
                     if record:
-                        scholastic_status_value = record[0]
-                        scholarship_value = record[1]
+                        scholastic_status_value = record.ScholasticStatus
+                        scholarship_value = record.ScholarshipStatus
 
                 with st.form("Update and Delete Academic Record", clear_on_submit=True):
                     col1, col2 = st.columns(2)
@@ -407,7 +223,7 @@ def app():
                         if update:
                             if selected_student_name and selected_student_id and selected_year_level and selected_semester:
                                 # Perform update operation
-                                update_success = updateAcademicRecords(selected_student_id, selected_year_level, selected_semester, updated_scholastic_status, updated_scholarship_status)
+                                update_success = students.update_academic_record(students.AcademicRecord(selected_student_id, selected_year_level, selected_semester, updated_scholastic_status, updated_scholarship_status))
                                 if update_success:
                                     st.session_state.operation_success = "Academic record updated successfully."
                                 else:
@@ -422,6 +238,39 @@ def app():
                     st.success(st.session_state.operation_success)
                     st.session_state.operation_success = None
 
+# --------------------------------------------------------- #
+    elif selected == "Import Students":
+        st.header("Import Students")
+        st.write("Upload a CSV or Excel file with the columns " + ", ".join(student_import.STUDENT_COLUMNS) +
+                 ". Address may also be given as Region, Province, City and Barangay columns.")
+
+        with st.form("import_form", clear_on_submit=True):
+            uploaded_file = st.file_uploader("Student List", type=["csv", "xlsx"])
+            dry_run = st.checkbox("Validate only (do not register)")
+            submitted = st.form_submit_button("Import")
+
+        if submitted:
+            if uploaded_file is None:
+                st.warning("Please choose a file to import.")
+            else:
+                try:
+                    result = student_import.import_students(uploaded_file, dry_run=dry_run)
+                except ValueError as e:
+                    st.error(f"Could not read {uploaded_file.name}: {e}")
+                else:
+                    if dry_run:
+                        st.info(f"{result.inserted} student(s) are ready to be registered.")
+                    else:
+                        st.success(f"{result.inserted} student(s) registered successfully.")
+                    if not result.rejected.empty:
+                        st.warning(f"{len(result.rejected)} row(s) were rejected.")
+                        st.dataframe(result.rejected, hide_index=True)
+                        st.download_button(
+                            label="Download rejected rows as CSV",
+                            data=result.rejected.to_csv(index=False).encode('utf-8'),
+                            file_name="rejected_students.csv",
+                            mime="text/csv",
+                        )
 
 # -----------------------------------------------------
         # Student Directory
@@ -429,42 +278,26 @@ def app():
         st.header("Student Record")
 
 
-        # Fetching student IDs and names
-        cur.execute("SELECT StudentID, Name FROM student")
-        students = cur.fetchall()
-        # Sort students alphabetically based on the last word of their name
-        sorted_students = sorted(students, key=lambda x: x[1].split()[-1])
-
-        # Create a dictionary for mapping student name to ID
-        student_dict = {name: sid for sid, name in sorted_students}
-
-        # Selection box for existing students
-        selected_student_name = st.selectbox("Select Student to Update", options=[""] + list(student_dict.keys()))
+        # Search box for existing students
+        selected_student_id, selected_student_name = student_search.student_picker("Select Student to Update", key="directory_student", allow_blank=True)
 
         if selected_student_name:
-            selected_student_id = student_dict[selected_student_name]
-
             # Fetch and display student details
-            student_details = get_student_details(selected_student_id)
+            student_details = students.get_student(conn, selected_student_id)
             if student_details:
-                st.write(f"**Name:** {student_details[1]}")
-                st.write(f"**ID Number:** {student_details[0]}")
-                st.write(f"**BirthDate:** {student_details[2]}")
-                st.write(f"**Sex:** {student_details[3]}")
-                st.write(f"**Gender:** {student_details[4]}")
-                st.write(f"**Religion:** {student_details[5]}")
-                st.write(f"**Address:** {student_details[6]}")
-                st.write(f"**Track:** {student_details[7]}")
-                st.write(f"**Program:** {student_details[8]}")
-                st.write(f"**Phone Number:** {student_details[9]}")
+                st.write(f"**Name:** {student_details.Name}")
+                st.write(f"**ID Number:** {student_details.StudentID}")
+                st.write(f"**BirthDate:** {student_details.BirthDate}")
+                st.write(f"**Sex:** {student_details.Sex}")
+                st.write(f"**Gender:** {student_details.Gender}")
+                st.write(f"**Religion:** {student_details.Religion}")
+                st.write(f"**Address:** {student_details.Address}")
+                st.write(f"**Track:** {student_details.Track}")
+                st.write(f"**Program:** {student_details.Program}")
+                st.write(f"**Phone Number:** {student_details.ContactNumber}")
 
             # Fetch the academic records for the selected student
-            assignments = pd.read_sql_query(
-                "SELECT ar.YearLevel, ar.Semester, ar.ScholasticStatus, ar.ScholarshipStatus "
-                "FROM academicrecords ar "
-                "WHERE ar.StudentID = ? "
-                "ORDER BY ar.YearLevel AND ar.Semester", conn, params=(selected_student_id,)
-            )
+            assignments = students.academic_records(conn, selected_student_id)
 
             if not assignments.empty:
                 # Group by Year Level and Semester
@@ -475,20 +308,41 @@ def app():
             else:
                 st.warning(f"No academic records found for {selected_student_name}.")
         else:
-            all_assignments = pd.read_sql_query(
-                "SELECT s.StudentID, s.Name, s.Sex, s.Gender, s.Religion, s.Address, s.Track, s.Program, ar.ScholasticStatus, ar.ScholarshipStatus, s.ContactNumber, ar.Semester, ar.YearLevel,     ROW_NUMBER() OVER(PARTITION BY ar.YearLevel, ar.Semester ORDER BY ar.YearLevel, ar.Semester) AS SemesterSequence "
-                "FROM academicrecords ar "
-                "JOIN student s ON ar.StudentID = s.StudentID "  # Correct join condition
-                "ORDER BY ar.YearLevel, ar.Semester", conn
+            col1, col2, col3, col4 = st.columns(4)
+            filters = (
+                col1.selectbox("Year Level", [""] + yrlvl_list, key="directory_year"),
+                col2.selectbox("Semester", [""] + semester_list, key="directory_sem"),
+                col3.selectbox("Program", [""] + program_list, key="directory_program"),
+                col4.selectbox("Scholastic Status", [""] + scholastic_status_list, key="directory_status"),
             )
 
+            # Keys of the pages seen so far; a filter change starts again from the first page
+            if st.session_state.get("directory_filters") != filters:
+                st.session_state.directory_filters = filters
+                st.session_state.directory_pages = [None]
+            pages = st.session_state.directory_pages
+
+            all_assignments = students.directory_page(conn, filters, pages[-1])
+            has_next = len(all_assignments) > students.DIRECTORY_PAGE_SIZE
+            all_assignments = all_assignments.head(students.DIRECTORY_PAGE_SIZE)
+
             if not all_assignments.empty:
+                term_counts = students.directory_counts(conn, filters)
+                st.write(f"Showing {len(all_assignments)} of {sum(term_counts.values())} records (page {len(pages)})")
+
                 # Group by Year Level and Semester
-                grouped_all_records = all_assignments.groupby(['YearLevel', 'Semester'])
+                grouped_all_records = all_assignments.groupby(['YearLevel', 'Semester'], sort=False)
                 for (year_level, semester), group in grouped_all_records:
                     st.markdown(f"**Year Level {year_level} - {semester}**")
-                    total_students = group.shape[0]  # Number of rows in the dataframe
-                    st.write(f"Total number of students: {total_students}")
-                    st.dataframe(group)
+                    st.write(f"Total number of students: {term_counts.get((year_level, semester), 0)}")
+                    st.dataframe(group.drop(columns="RecordID"), hide_index=True)
+
+                col1, col2 = st.columns(2)
+                if col1.button("Previous", disabled=len(pages) == 1):
+                    pages.pop()
+                    st.experimental_rerun()
+                if col2.button("Next", disabled=not has_next):
+                    pages.append(students.page_key(all_assignments))
+                    st.experimental_rerun()
             else:
-                st.warning("No academic records found.")
\ No newline at end of file
+                st.warning("No academic records found.")
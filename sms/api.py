@@ -0,0 +1,264 @@
+# Read-only HTTP/JSON API over the registrar data, for offices that need
+# transcripts, GPA lists or the prospectus without going through the UI.
+# Every response carries an ETag built from the table_version counters of
+# the tables it reads, so a client revalidating unchanged data gets a 304
+# without the query being run.
+#
+#   python api.py --port 8502
+#   curl 'localhost:8502/gpa?year_level=1st&semester=1st+Term&limit=50'
+#
+# Lists are paged by key: pass a response's "next" back as ?after= for the
+# following page; "next" is null on the last one.
+#
+#   GET /students                         ?after=&limit=
+#   GET /students/<StudentID>             with its academic records
+#   GET /students/<StudentID>/gpa         GPA and CGPA per term
+#   GET /courseassignments                ?student=&after=&limit=
+#   GET /gpa                              ?year_level=&semester=&after=&limit=, best GPA first
+#   GET /prospectus                       ?q=&after=&limit=
+import argparse
+import base64
+import hashlib
+import json
+import re
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import course_search
+import db
+import schema
+from services import prospectus, students
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("Invalid after cursor") from None
+
+
+def _limit(query):
+    try:
+        limit = int(query.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limit must be a number") from None
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def _rows(cursor):
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _page(conn, sql, params, key_columns, query):
+    # One page of `sql`, which must end in its ORDER BY and take a LIMIT parameter.
+    # The extra row fetched tells whether there is a next page.
+    limit = _limit(query)
+    items = _rows(conn.execute(sql + " LIMIT ?", params + [limit + 1]))
+    more = len(items) > limit
+    items = items[:limit]
+    next_key = [items[-1][column] for column in key_columns] if more else None
+    return {"items": items, "next": encode_cursor(next_key) if next_key else None}
+
+
+def _key_part(value, default):
+    # Whether a cursor value has the type of the key column `default` stands for
+    if isinstance(value, bool):
+        return False
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return type(value) is type(default)
+
+
+def _after(query, default):
+    # Key to continue after, shaped like `default` (the key of the first page):
+    # a cursor from another endpoint has the wrong length or types and is rejected
+    if "after" not in query:
+        return default
+    key = decode_cursor(query["after"])
+    if not isinstance(key, list) or len(key) != len(default) or not all(map(_key_part, key, default)):
+        raise ValueError("Invalid after cursor")
+    return key
+
+
+def list_students(conn, query):
+    (after,) = _after(query, [""])
+    return _page(
+        conn, f"SELECT {', '.join(students.Student._fields)} FROM student WHERE StudentID > ? ORDER BY StudentID",
+        [after], ["StudentID"], query
+    )
+
+
+def get_student(conn, query, student_id):
+    student = students.get_student(conn, student_id)
+    if student is None:
+        return None
+    records = conn.execute(
+        f"SELECT {', '.join(students.AcademicRecord._fields)} FROM academicrecords WHERE StudentID = ? ORDER BY YearLevel, Semester",
+        (student_id,)
+    )
+    return {**student._asdict(), "AcademicRecords": _rows(records)}
+
+
+def student_gpa(conn, query, student_id):
+    if students.get_student(conn, student_id) is None:
+        return None
+    terms = conn.execute(
+        "SELECT YearLevel, Semester, Units, GPA, CumulativeUnits, CGPA FROM term_gpa WHERE StudentID = ? ORDER BY TermOrder",
+        (student_id,)
+    )
+    return {"StudentID": student_id, "terms": _rows(terms)}
+
+
+def list_course_assignments(conn, query):
+    (after,) = _after(query, [0])
+    sql = """SELECT ca.EnrollID, ca.StudentID, ca.CourseCode, p.CourseDesc, p.Units, ca.Grade, ca.FinalGrade, ca.GradeStatus,
+            ca.AcademicYear, ca.YearLevel, ca.Semester
+        FROM courseassignment ca
+        LEFT JOIN prospectus p ON ca.CourseCode = p.CourseCode
+        WHERE ca.EnrollID > ?"""
+    params = [after]
+    if query.get("student"):
+        sql += " AND ca.StudentID = ?"
+        params.append(query["student"])
+    return _page(conn, sql + " ORDER BY ca.EnrollID", params, ["EnrollID"], query)
+
+
+def list_gpa(conn, query):
+    # One term's GPA list, read off the term_gpa index in GPA order
+    if not query.get("year_level") or not query.get("semester"):
+        raise ValueError("year_level and semester are required")
+    gpa, student_id = _after(query, [0.0, ""])
+    return _page(
+        conn, """SELECT g.StudentID, s.Name, g.YearLevel, g.Semester, g.Units, g.GPA, g.CGPA
+        FROM term_gpa g
+        JOIN student s ON s.StudentID = g.StudentID
+        WHERE g.YearLevel = ? AND g.Semester = ? AND g.GPA IS NOT NULL AND (g.GPA, g.StudentID) > (?, ?)
+        ORDER BY g.GPA, g.StudentID""",
+        [query["year_level"], query["semester"], gpa, student_id], ["GPA", "StudentID"], query
+    )
+
+
+def list_prospectus(conn, query):
+    (after,) = _after(query, [""])
+    matches, params = course_search.matches_sql(conn, query.get("q", ""))
+    return _page(
+        conn, f"""SELECT p.CourseCode, p.CourseDesc, p.Units, p.Semester, p.YearLevel, p.Classification, {prospectus.REQUISITE_CODES_SQL}
+        FROM prospectus p
+        WHERE p.CourseCode IN (SELECT CourseCode FROM ({matches})) AND p.CourseCode > ?
+        ORDER BY p.CourseCode""",
+        params + [after], ["CourseCode"], query
+    )
+
+
+ENTITY_TAG = re.compile(r'\s*(\*|(?:W/)?"[^"]*")\s*(?:,|$)')
+
+
+def etag_matches(header, etag):
+    # If-None-Match is "*" or a comma-separated list of entity tags, each compared
+    # whole; GET uses the weak comparison, so W/"x" matches "x" (RFC 9110, 13.1.2)
+    tags = [match.group(1) for match in ENTITY_TAG.finditer(header)]
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+# (path pattern, tables the response is read from, view); views return None for a 404
+ROUTES = [
+    (re.compile(r"/students"), ("student",), list_students),
+    (re.compile(r"/students/([^/]+)"), ("student", "academicrecords"), get_student),
+    (re.compile(r"/students/([^/]+)/gpa"), ("student", "courseassignment", "prospectus"), student_gpa),
+    (re.compile(r"/courseassignments"), ("courseassignment", "prospectus"), list_course_assignments),
+    (re.compile(r"/gpa"), ("student", "courseassignment", "prospectus"), list_gpa),
+    (re.compile(r"/prospectus"), ("prospectus", "requisite_edge"), list_prospectus),
+]
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so a client's requests stay on one thread and its pooled connection.
+    # Headers and body are separate writes; without TCP_NODELAY the body waits
+    # for the client's delayed ACK, about 40 ms per response.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    quiet = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        for pattern, tables, view in ROUTES:
+            match = pattern.fullmatch(url.path.rstrip("/") or "/")
+            if match:
+                break
+        else:
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        conn = db.get_connection()
+        versions = db.table_version(conn, *tables)
+        etag = '"' + hashlib.sha1(f"{versions}{self.path}".encode()).hexdigest()[:20] + '"'
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            return self.send_json(HTTPStatus.NOT_MODIFIED, None, etag)
+
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body = view(conn, query, *map(unquote, match.groups()))
+        except ValueError as e:
+            return self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        if body is None:
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+        self.send_json(HTTPStatus.OK, body, etag)
+
+    def send_json(self, status, body, etag=None):
+        data = b"" if body is None else json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep the response but must revalidate it
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host, port, quiet=False):
+    handler = type("Handler", (Handler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the registrar data as read-only JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", help="database file (default: SMS_DB_PATH or studentmonitor.db)")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.configure(args.db)
+    schema.bootstrap()
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"Serving {db.DB_PATH} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
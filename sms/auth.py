@@ -0,0 +1,24 @@
+import db
+
+
+def fetch_credentials(conn):
+    # (names, usernames, password hashes) as parallel lists, the way
+    # streamlit_authenticator.Authenticate takes them
+    rows = conn.execute("SELECT Name, Username, PasswordHash FROM users ORDER BY Username").fetchall()
+    names, usernames, password_hashes = (list(column) for column in zip(*rows)) if rows else ([], [], [])
+    return names, usernames, password_hashes
+
+
+# Read once per process and again only after the users table is written to
+@db.cached_by_version("users")
+def credentials():
+    return fetch_credentials(db.get_connection())
+
+
+def set_user(conn, username, name, password_hash):
+    # Add an account, or replace the name and password of an existing one
+    conn.execute(
+        """INSERT INTO users (Username, Name, PasswordHash) VALUES (?, ?, ?)
+        ON CONFLICT(Username) DO UPDATE SET Name = excluded.Name, PasswordHash = excluded.PasswordHash""",
+        (username, name, password_hash)
+    )
@@ -0,0 +1,28 @@
+# Course Assignment: requisite checks for a batch of students, the graph they use,
+# and the Course Directory reads
+import requisites
+from services import enrollment
+
+
+def bench_check_requisites(benchmark, database):
+    # A class-sized batch, each student picking the same fourth-year courses
+    student_ids = [row[0] for row in database.execute("SELECT StudentID FROM student ORDER BY StudentID LIMIT 50")]
+    course_codes = [row[0] for row in database.execute("SELECT CourseCode FROM prospectus WHERE YearLevel = '4'")]
+    results = benchmark(requisites.check_requisites, database, {student_id: course_codes for student_id in student_ids})
+    assert len(results) == len(student_ids)
+
+
+def bench_curriculum_graph(benchmark, database):
+    # Cold build from requisite_edge
+    graph = benchmark.pedantic(requisites.curriculum_graph, setup=requisites.curriculum_graph.cache_clear, rounds=50)
+    assert not graph.cycles()
+
+
+def bench_student_courses(benchmark, database, student_id):
+    courses = benchmark(enrollment.student_courses, database, student_id)
+    assert not courses.empty
+
+
+def bench_course_counts(benchmark, database):
+    counts = benchmark(enrollment.course_counts, database)
+    assert not counts.empty
@@ -0,0 +1,21 @@
+# Data path behind Dashboard.app(): the per-term rollups and the cached lookup
+from services import analytics
+import grading
+
+
+def bench_term_rollups(benchmark, database):
+    # Cold build, as on the first view after any write
+    rollups = benchmark(analytics.term_rollups, database)
+    assert rollups
+
+
+def bench_dashboard_metrics_cached(benchmark, database):
+    # Every rerun after the first: a version check and a dict lookup
+    analytics.dashboard_rollups()
+    metrics = benchmark(analytics.dashboard_metrics, grading.YEAR_LEVELS[0], grading.SEMESTERS[0])
+    assert metrics.student_total
+
+
+def bench_rollup_table(benchmark, database):
+    table = benchmark(analytics.rollup_table, analytics.dashboard_rollups())
+    assert not table.empty
@@ -0,0 +1,83 @@
+# Not timings: checks that the term_gpa table kept by the SQL triggers
+# (schema._grade_point_sql / term_gpa_refresh_sql) agrees with
+# grading.term_gpas on the same rows, so the two cannot drift apart unnoticed,
+# including after the grading rules change under an existing database.
+import shutil
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+import grading
+import schema
+from conftest import SIZES
+
+# (Grade, FinalGrade) pairs the seeded data does not produce: grades typed in
+# any case, with stray spaces, unparseable or missing, and NULL final grades
+EDGE_GRADES = [
+    ("inc", None), ("Inc", "1.5"), ("inc", "abc"), ("INPROG", None), ("inprog", "2"),
+    ("", None), (None, None), ("abc", None), ("abc", "1.25"), (" 2.5 ", None), ("2", "3"),
+    ("1.50", None), ("drp", None), ("w", None), ("p", None), ("5", ""),
+]
+
+
+def add_edge_grades(conn):
+    # One extra term per edge grade for a handful of students, some in a Summer
+    # Term the seed never uses; the triggers refresh term_gpa as they go
+    students = [row[0] for row in conn.execute("SELECT StudentID FROM student ORDER BY StudentID LIMIT 5")]
+    courses = [row[0] for row in conn.execute("SELECT CourseCode FROM prospectus ORDER BY CourseCode")]
+    rows = []
+    for index, (grade, final_grade) in enumerate(EDGE_GRADES):
+        for offset, student_id in enumerate(students):
+            rows.append((student_id, courses[(index + offset) % len(courses)], grade, final_grade,
+                         grading.YEAR_LEVELS[offset % len(grading.YEAR_LEVELS)],
+                         grading.SEMESTERS[(index + offset) % len(grading.SEMESTERS)]))
+    with conn:
+        conn.executemany(
+            "INSERT INTO courseassignment (StudentID, CourseCode, Grade, FinalGrade, GradeStatus, AcademicYear, YearLevel, Semester) VALUES (?, ?, ?, ?, '', '2024-2025', ?, ?)",
+            rows
+        )
+
+
+def copy_seeded(seeded, tmp_path):
+    path = tmp_path / "studentmonitor.db"
+    shutil.copyfile(seeded(SIZES[0]), path)
+    return sqlite3.connect(path)
+
+
+def assert_matches_grading(conn):
+    columns = ["StudentID", "YearLevel", "Semester", "Units", "GPA", "CumulativeUnits", "CGPA"]
+    stored = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM term_gpa", conn)
+    frame = pd.read_sql_query(
+        """SELECT ca.StudentID, ca.CourseCode, ca.Grade, ca.FinalGrade, p.Units, ca.YearLevel, ca.Semester
+        FROM courseassignment ca JOIN prospectus p ON ca.CourseCode = p.CourseCode""",
+        conn
+    )
+    computed = grading.term_gpas(frame)[columns]
+
+    keys = ["StudentID", "YearLevel", "Semester"]
+    merged = stored.merge(computed, on=keys, how="outer", suffixes=("_sql", "_pandas"), indicator=True)
+    assert (merged["_merge"] == "both").all(), merged.loc[merged["_merge"] != "both", keys]
+    for column in ["Units", "GPA", "CumulativeUnits", "CGPA"]:
+        sql, pandas = merged[f"{column}_sql"].astype(float), merged[f"{column}_pandas"].astype(float)
+        same = np.isclose(sql, pandas, rtol=0, atol=1e-4, equal_nan=True)
+        assert same.all(), merged.loc[~same, keys + [f"{column}_sql", f"{column}_pandas"]]
+
+
+def bench_term_gpa_matches_grading(seeded, tmp_path):
+    conn = copy_seeded(seeded, tmp_path)
+    add_edge_grades(conn)
+    assert_matches_grading(conn)
+    conn.close()
+
+
+def bench_term_gpa_follows_rule_changes(seeded, tmp_path, monkeypatch):
+    # An existing database picks up changed grading rules on the next bootstrap
+    conn = copy_seeded(seeded, tmp_path)
+    assert not schema.sync_term_gpa_rules(conn)
+    monkeypatch.setitem(grading.GRADE_POINTS, "3.00", 4.00)
+    monkeypatch.setattr(grading, "EXCLUDED_COURSES", grading.EXCLUDED_COURSES + ["STT110"])
+    assert schema.sync_term_gpa_rules(conn)
+    add_edge_grades(conn)
+    assert_matches_grading(conn)
+    conn.close()
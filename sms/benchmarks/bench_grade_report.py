@@ -0,0 +1,21 @@
+# Grade Evaluation: one student's grades with their GPA/CGPA per term, and the
+# full recompute that the term_gpa triggers save the page from doing
+import pandas as pd
+
+import grading
+import services.grades
+
+
+def bench_grade_evaluation(benchmark, database, student_id):
+    terms = benchmark(services.grades.evaluation, database, student_id)
+    assert terms
+
+
+def bench_term_gpas_recompute(benchmark, database):
+    frame = pd.read_sql_query(
+        """SELECT ca.StudentID, ca.CourseCode, ca.Grade, ca.FinalGrade, p.Units, ca.YearLevel, ca.Semester
+        FROM courseassignment ca JOIN prospectus p ON ca.CourseCode = p.CourseCode""",
+        database
+    )
+    terms = benchmark(grading.term_gpas, frame)
+    assert len(terms)
@@ -0,0 +1,88 @@
+# Per-rerun cost of the login gate, before and after moving credentials into
+# the users table and skipping the authenticator once logged in. Runs against
+# a scratch database seeded from hashed_pw.pkl; the gate rows need
+# streamlit_authenticator and run outside `streamlit run`.
+#
+#   python benchmarks/bench_login.py [--number 2000]
+import argparse
+import importlib.util
+import pickle
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import auth
+import db
+import schema
+
+
+def legacy_credentials():
+    # What Main.py did on every rerun before the users table
+    names = ["Johniel Babiera", "Daisy Polestico"]
+    usernames = ["jbabiera", "dpolestico"]
+    with schema.LEGACY_PASSWORD_FILE.open("rb") as file:
+        hashed_passwords = pickle.load(file)
+    return names, usernames, hashed_passwords
+
+
+def login_gate(credentials):
+    # What a rerun with the login form showing pays, as Main.py does it
+    import streamlit as st
+    import streamlit_authenticator as stauth
+
+    # Outside `streamlit run` session state keeps nothing between calls and
+    # login() reads keys Authenticate() set; a dict stands in for a session
+    # still at the login form
+    st.session_state = {}
+
+    def gate():
+        names, usernames, hashed_passwords = credentials()
+        authenticator = stauth.Authenticate(names, usernames, hashed_passwords, "application_system", "abcdef", cookie_expiry_days=0)
+        return authenticator.login("Login", "main")
+    return gate
+
+
+def cases(session_state):
+    # Credential loading on its own. The cached read pays a table_version check
+    # and is slower than unpickling a two-user file (about 11 us against 7 us)
+    yield "credentials: unpickle hashed_pw.pkl", legacy_credentials
+    yield "credentials: cached users table", auth.credentials
+    # The whole gate per rerun. Before, every rerun built the authenticator;
+    # after, only reruns showing the login form do, at about the same cost
+    # (~0.2 ms). The saving is in skipping it once logged in.
+    if importlib.util.find_spec("streamlit_authenticator"):
+        yield "gate before: unpickle + Authenticate + login()", login_gate(legacy_credentials)
+        yield "gate after, form shown: cache + Authenticate + login()", login_gate(auth.credentials)
+    yield "gate after, logged in this session", lambda: session_state.get("authentication_status")
+    try:
+        import bcrypt
+    except ImportError:
+        return
+    # A throwaway hash, checked once per login attempt, not per rerun; shown for scale
+    password_hash = bcrypt.hashpw(b"bench", bcrypt.gensalt())
+    yield "bcrypt password check", lambda: bcrypt.checkpw(b"bench", password_hash)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the login gate's work per Streamlit rerun.")
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db.configure(Path(directory) / "bench.db")
+        schema.bootstrap()
+        session_state = {"authentication_status": True, "name": "Johniel Babiera"}
+        for label, function in cases(session_state):
+            # The authenticator and bcrypt rows are far slower per call
+            number = 3 if "bcrypt" in label else max(args.number // 20, 1) if "login()" in label else args.number
+            best = min(timeit.repeat(function, number=number, repeat=5)) / number
+            print(f"{label:56} {best * 1e6:12.1f} us")
+        db.configure(db.DEFAULT_DB_PATH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+# Whole pages rendered headlessly, on Streamlit versions that ship AppTest
+import pytest
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+PAGES = ["Dashboard", "Student_Registration", "Prospectus", "Course_Assignment", "Grade_Report"]
+
+
+def render(page):
+    app = AppTest.from_string(f"import {page}\n{page}.app()", default_timeout=60)
+    app.run()
+    assert not app.exception, app.exception
+    return app
+
+
+@pytest.mark.parametrize("page", PAGES)
+def bench_page(benchmark, database, page):
+    benchmark.pedantic(render, args=(page,), rounds=5)
@@ -0,0 +1,16 @@
+# Prospectus listing, with and without a search
+import pytest
+
+from services import prospectus
+
+
+@pytest.mark.parametrize("search_query", ["", "stat", "data analysis"])
+def bench_prospectus_listing(benchmark, database, search_query):
+    listing = benchmark(prospectus.listing, database, search_query)
+    assert not listing.empty
+
+
+def bench_prospectus_terms(benchmark, database):
+    listing = prospectus.listing(database)
+    terms = benchmark(lambda: list(prospectus.terms(listing)))
+    assert terms
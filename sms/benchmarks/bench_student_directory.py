@@ -0,0 +1,40 @@
+# Student Directory: a keyset page, the per-term counts, and the name search
+import pytest
+
+import student_search
+from services import students
+
+FILTERS = {
+    "none": ("", "", "", ""),
+    "semester": ("", "2nd Term", "", ""),
+    "all": (2, "1st Term", "BS Statistics", "Regular"),
+}
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def bench_directory_first_page(benchmark, database, filters):
+    page = benchmark(students.directory_page, database, filters)
+    assert not page.empty
+
+
+def bench_directory_deep_page(benchmark, database):
+    # Halfway through the unfiltered directory; costs the same as the first page
+    filters = FILTERS["none"]
+    middle = database.execute("SELECT COUNT(*) / 2 FROM academicrecords").fetchone()[0]
+    after = database.execute(
+        "SELECT YearLevel, Semester, RecordID FROM academicrecords ORDER BY YearLevel, Semester, RecordID LIMIT 1 OFFSET ?", (middle,)
+    ).fetchone()
+    page = benchmark(students.directory_page, database, filters, after)
+    assert not page.empty
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def bench_directory_counts(benchmark, database, filters):
+    counts = benchmark(students.directory_counts, database, filters)
+    assert counts
+
+
+@pytest.mark.parametrize("query", ["park", "sana im", "2000-01"])
+def bench_search_students(benchmark, database, query):
+    matches = benchmark(student_search.search_students, database, query)
+    assert matches
@@ -0,0 +1,42 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db
+from seed import seed_database
+
+# Student counts to seed, smallest first; the 100k database takes a few minutes to build
+SIZES = [int(size) for size in os.environ.get("SMS_BENCH_SIZES", "1000,10000,100000").split(",")]
+
+
+@pytest.fixture(scope="session")
+def seeded(tmp_path_factory):
+    # {students: path}, each database built on first use and shared by the whole run
+    paths = {}
+
+    def path(students):
+        if students not in paths:
+            paths[students] = seed_database(tmp_path_factory.mktemp("db") / "studentmonitor.db", students)
+        return paths[students]
+    return path
+
+
+@pytest.fixture(params=SIZES, ids=lambda students: f"{students}_students")
+def database(request, seeded):
+    # Point db at the seeded file for this size; yields the pooled connection
+    original = db.DB_PATH
+    db.configure(seeded(request.param))
+    yield db.get_connection()
+    db.configure(original)
+
+
+@pytest.fixture
+def student_id(database):
+    # A fourth-year student, who has the longest grade history
+    return database.execute(
+        "SELECT StudentID FROM courseassignment WHERE YearLevel = '4th' ORDER BY EnrollID LIMIT 1"
+    ).fetchone()[0]
@@ -0,0 +1,117 @@
+# Deterministic synthetic studentmonitor.db for the benchmarks.
+#
+#   python benchmarks/seed.py /tmp/studentmonitor.db --students 10000
+import argparse
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+import grading
+import requisites
+import schema
+
+COURSES_PER_TERM = 6
+PROSPECTUS_SEMESTERS = ["1st Sem", "2nd Sem"]
+PROGRAMS = ["BS Statistics", "BS Mathematics"]
+SUBJECTS = ["STT", "MAT", "CSC", "ENG", "PHY", "SOC"]
+TOPICS = ["Probability", "Calculus", "Linear Algebra", "Data Analysis", "Programming", "Sampling", "Regression",
+          "Statistical Theory", "Numerical Methods", "Discrete Mathematics", "Research Methods", "Ethics"]
+FIRST_NAMES = ["Sana", "Mina", "Momo", "Jihyo", "Nayeon", "Dahyun", "Chaeyoung", "Tzuyu", "Jeongyeon", "Johniel", "Daisy", "Maria"]
+LAST_NAMES = ["Minatozaki", "Myoui", "Hirai", "Park", "Im", "Kim", "Son", "Chou", "Yoo", "Dela Cruz", "Santos", "Reyes", "Babiera", "Polestico"]
+# Initial grades roughly as they appear in practice
+GRADE_WEIGHTS = {"1.00": 4, "1.25": 8, "1.50": 12, "1.75": 14, "2.00": 14, "2.25": 12, "2.50": 10, "2.75": 7, "3.00": 6,
+                 "5.00": 4, "INC": 3, "INPROG": 2, "DRP": 1, "W": 1}
+
+
+def curriculum():
+    # [(CourseCode, CourseDesc, Units, YearLevel index, Semester index)] plus requisite edges
+    courses, edges = [], []
+    previous = []
+    for year in range(len(grading.YEAR_LEVELS)):
+        for semester in range(len(PROSPECTUS_SEMESTERS)):
+            term = []
+            for index in range(COURSES_PER_TERM):
+                code = f"{SUBJECTS[index]}{year + 1}{semester + 1}{index}"
+                description = f"{TOPICS[(year * 7 + semester * 3 + index) % len(TOPICS)]} {year + 1}{semester + 1}{index}"
+                courses.append((code, description, 3 if index < 5 else 2, year, semester))
+                term.append(code)
+                if previous:
+                    edges.append((code, previous[index], "pre"))
+            previous = term
+    return courses, edges
+
+
+def seed_database(path, students, seed=0):
+    # Create a database at `path` with `students` students and their records
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    schema.migrate(conn, target=3)
+
+    courses, edges = curriculum()
+    with conn:
+        conn.executemany(
+            "INSERT INTO prospectus (CourseCode, CourseDesc, Units, Semester, YearLevel, Classification) VALUES (?, ?, ?, ?, ?, ?)",
+            [(code, description, units, PROSPECTUS_SEMESTERS[semester], str(year + 1), "Major" if units == 3 else "Minor")
+             for code, description, units, year, semester in courses]
+        )
+        for code in {course_code for course_code, _, _ in edges}:
+            requisites.set_requisites(conn, code, [requires for course_code, requires, _ in edges if course_code == code], [])
+
+    student_rows, record_rows, enrollments = [], [], []
+    grades, weights = list(GRADE_WEIGHTS), list(GRADE_WEIGHTS.values())
+    for index in range(students):
+        student_id = f"{2000 + index // 10000:04d}-{index % 10000:04d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice('ABCDEFGH')}. {rng.choice(LAST_NAMES)}"
+        student_rows.append((student_id, name, "January 1, 2004", rng.choice(["Female", "Male"]), "Female", "Roman Catholic",
+                             "Region IX, Zamboanga del Sur, Pagadian City, Santiago", "STEM", rng.choice(PROGRAMS), "09123456789"))
+        terms = rng.randint(1, len(grading.YEAR_LEVELS) * len(PROSPECTUS_SEMESTERS))
+        for term in range(terms):
+            year, semester = divmod(term, len(PROSPECTUS_SEMESTERS))
+            record_rows.append((student_id, rng.choice(["Regular", "Irregular"]), rng.choice(["", "DOST", "CHED"]), year + 1, grading.SEMESTERS[semester]))
+            term_courses = courses[term * COURSES_PER_TERM:(term + 1) * COURSES_PER_TERM]
+            for code, grade in zip((course[0] for course in term_courses), rng.choices(grades, weights, k=COURSES_PER_TERM)):
+                enrollments.append((student_id, code, grade, f"{2020 + year}-{2021 + year}", grading.YEAR_LEVELS[year], grading.SEMESTERS[semester]))
+
+    enrollments = pd.DataFrame(enrollments, columns=["StudentID", "CourseCode", "Grade", "AcademicYear", "YearLevel", "Semester"])
+    enrollments["FinalGrade"], enrollments["GradeStatus"] = grading.resolve_grades(enrollments["Grade"], pd.Series("", index=enrollments.index))
+    with conn:
+        conn.executemany(
+            "INSERT INTO student (StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            student_rows
+        )
+        conn.executemany(
+            "INSERT INTO academicrecords (StudentID, ScholasticStatus, ScholarshipStatus, YearLevel, Semester) VALUES (?, ?, ?, ?, ?)",
+            record_rows
+        )
+        conn.executemany(
+            "INSERT INTO courseassignment (StudentID, CourseCode, Grade, FinalGrade, GradeStatus, AcademicYear, YearLevel, Semester) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            enrollments[["StudentID", "CourseCode", "Grade", "FinalGrade", "GradeStatus", "AcademicYear", "YearLevel", "Semester"]].itertuples(index=False, name=None)
+        )
+
+    # Summary tables and search indexes are built once over the loaded data
+    schema.migrate(conn)
+    conn.execute("ANALYZE")
+    conn.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic studentmonitor.db for benchmarking.")
+    parser.add_argument("path")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if Path(args.path).exists():
+        parser.error(f"{args.path} already exists")
+    seed_database(args.path, args.students, args.seed)
+    print(f"Wrote {args.students} students to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+import db
+import grading
+
+
+class ClassRecordSummary(NamedTuple):
+    matched: int
+    changed: pd.DataFrame    # StudentID, old and new Grade/FinalGrade/GradeStatus
+    unmatched: pd.DataFrame  # StudentID not enrolled in the course for the term
+    invalid: pd.DataFrame    # Row (1-based, as in the sheet), StudentID, Grade, FinalGrade, Reason; not saved
+
+
+def read_class_record(source):
+    name = str(getattr(source, "name", source)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        sheet = pd.read_excel(source, dtype=str, keep_default_na=False)
+    else:
+        sheet = pd.read_csv(source, dtype=str, keep_default_na=False)
+    sheet = sheet.rename(columns=lambda column: str(column).strip())
+    for column in ["StudentID", "Grade"]:
+        if column not in sheet.columns:
+            raise ValueError(f"Missing column: {column}")
+    if "FinalGrade" not in sheet.columns:
+        sheet["FinalGrade"] = ""
+    sheet = pd.DataFrame({
+        "StudentID": sheet["StudentID"].str.strip(),
+        "Grade": grading.normalize_grades(sheet["Grade"]),
+        "FinalGrade": grading.normalize_grades(sheet["FinalGrade"]),
+    })
+    sheet.index = range(2, 2 + len(sheet))  # header is row 1
+    return sheet[sheet["StudentID"] != ""].drop_duplicates("StudentID", keep="last")
+
+
+def validate(sheet):
+    # One reason per row, as student_import.validate; earlier checks win
+    grades = grading.GRADE_OPTIONS[1:]
+    reasons = pd.Series("", index=sheet.index)
+    checks = [
+        (sheet["Grade"] == "", "Missing grade"),
+        (~sheet["Grade"].isin(grades), "Unrecognised grade"),
+        ((sheet["FinalGrade"] != "") & ~sheet["FinalGrade"].isin(grades), "Unrecognised final grade"),
+    ]
+    for failed, reason in checks:
+        reasons = reasons.mask(failed & (reasons == ""), reason)
+    return reasons
+
+
+def fetch_enrollments(conn, course_code, year_level, semester, academic_year=None):
+    query = """SELECT EnrollID, StudentID, Grade, FinalGrade, GradeStatus
+        FROM courseassignment
+        WHERE CourseCode = ? AND YearLevel = ? AND Semester = ?"""
+    params = [course_code, year_level, semester]
+    if academic_year:
+        query += " AND AcademicYear = ?"
+        params.append(academic_year)
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def update_grades(conn, updates):
+    # updates: Grade, FinalGrade, GradeStatus, EnrollID columns; one statement for all rows.
+    # Blank values are stored as "", as the Grade Report always has.
+    rows = updates.astype(object).itertuples(index=False, name=None)
+    conn.executemany("UPDATE courseassignment SET Grade = ?, FinalGrade = ?, GradeStatus = ? WHERE EnrollID = ?", rows)
+
+
+def ingest_class_record(source, course_code, year_level, semester, academic_year=None, dry_run=False):
+    sheet = read_class_record(source)
+    reasons = validate(sheet)
+    bad = reasons[reasons != ""]
+    invalid = sheet.loc[bad.index, ["StudentID", "Grade", "FinalGrade"]].assign(Reason=bad)
+    invalid = invalid.rename_axis("Row").reset_index()
+    sheet = sheet[reasons == ""].copy()
+    sheet["FinalGrade"], sheet["GradeStatus"] = grading.resolve_grades(sheet["Grade"], sheet["FinalGrade"])
+
+    with db.transaction() as conn:
+        enrolled = fetch_enrollments(conn, course_code, year_level, semester, academic_year)
+        merged = sheet.merge(enrolled, on="StudentID", how="left", suffixes=("", "Old"), indicator=True)
+        unmatched = merged.loc[merged["_merge"] == "left_only", ["StudentID"]].reset_index(drop=True)
+        matched = merged[merged["_merge"] == "both"]
+
+        old = matched[["GradeOld", "FinalGradeOld", "GradeStatusOld"]].fillna("").astype(str)
+        new = matched[["Grade", "FinalGrade", "GradeStatus"]]
+        changed = matched[(old.to_numpy() != new.to_numpy()).any(axis=1)]
+
+        update_grades(conn, changed[["Grade", "FinalGrade", "GradeStatus", "EnrollID"]])
+        if dry_run:
+            conn.rollback()
+
+    changed = changed[["StudentID", "GradeOld", "Grade", "FinalGradeOld", "FinalGrade", "GradeStatusOld", "GradeStatus"]]
+    return ClassRecordSummary(len(matched), changed.reset_index(drop=True), unmatched, invalid)
@@ -0,0 +1,27 @@
+import db
+
+
+def match_expression(search_query):
+    # Every term must match as a word prefix in the code, description or classification.
+    # Terms are quoted so FTS5 operators and punctuation are taken literally.
+    terms = search_query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def matches_sql(conn, search_query):
+    # (sql, params) for a CourseCode, Rank query of the courses matching the search,
+    # best match first; meant to be used as a CTE or subquery
+    if not search_query.split():
+        return "SELECT CourseCode, 0 AS Rank FROM prospectus", []
+    # The FTS5 index is missing on SQLite builds without FTS5
+    if db.has_table(conn, "prospectus_fts"):
+        return """SELECT p.CourseCode, f.rank AS Rank
+            FROM prospectus_fts f JOIN prospectus p ON p.rowid = f.rowid
+            WHERE prospectus_fts MATCH ?""", [match_expression(search_query)]
+
+    sql = "SELECT CourseCode, 0 AS Rank FROM prospectus WHERE 1 = 1"
+    params = []
+    for term in search_query.split():
+        sql += " AND (CourseCode LIKE ? OR CourseDesc LIKE ? OR Classification LIKE ?)"
+        params += [f"%{term}%"] * 3
+    return sql, params
@@ -0,0 +1,157 @@
+import functools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+# The database lives next to the sms/ folder unless SMS_DB_PATH says otherwise
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "studentmonitor.db"
+DB_PATH = os.environ.get("SMS_DB_PATH", str(DEFAULT_DB_PATH))
+
+# Applied to every new connection. WAL lets readers run while a writer commits,
+# NORMAL sync is safe under WAL and saves an fsync per commit.
+PRAGMAS = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", 5000),
+    ("mmap_size", 268435456),
+    ("cache_size", -65536),
+]
+
+MAX_IDLE_CONNECTIONS = 8
+
+
+class _Lease:
+    # Holds a pooled connection for one thread; when the thread ends the
+    # thread-local is freed and the connection goes back to the pool.
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionPool:
+    def __init__(self, path, max_idle=MAX_IDLE_CONNECTIONS):
+        self.path = str(path)
+        self.closed = False
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self.closed:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def connection(self):
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = _Lease(self.acquire())
+            weakref.finalize(lease, self.release, lease.conn)
+            self._local.lease = lease
+        return lease.conn
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(path):
+    # Point the data layer at another database file (tests, CLI tools)
+    global DB_PATH, _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        DB_PATH = str(path)
+        _pool = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def get_connection():
+    # Connection owned by the calling thread for as long as the thread lives
+    return get_pool().connection()
+
+
+@contextmanager
+def transaction():
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def has_table(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def table_version(conn, *tables):
+    # Write counters kept by the table_version triggers, in the order asked for
+    rows = dict(conn.execute(
+        "SELECT TableName, Version FROM table_version WHERE TableName IN (SELECT value FROM json_each(?))",
+        (json.dumps(tables),)
+    ).fetchall())
+    return tuple(rows.get(table, 0) for table in tables)
+
+
+def cached_by_version(*tables):
+    # Cache a function's result per argument tuple until one of the tables is written to
+    def decorator(function):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(function)
+        def wrapper(*args):
+            key = (DB_PATH,) + args
+            version = table_version(get_connection(), *tables)
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and hit[0] == version:
+                return hit[1]
+            value = function(*args)
+            with lock:
+                cache[key] = (version, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
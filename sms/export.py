@@ -0,0 +1,181 @@
+# Bulk export of the registrar tables to CSV or Parquet. Rows are read with
+# fetchmany and written chunk by chunk, so memory stays bounded by the chunk
+# size whatever the table size. Parquet export is experimental: it needs the
+# optional pyarrow package (see requirements.txt), imported on first use.
+#
+#   python export.py --out /backups/2024-06-01              # every table, CSV
+#   python export.py gpa courseassignment --format parquet --out dumps
+import argparse
+import csv
+import importlib.util
+import io
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+import db
+import schema
+
+CHUNK_SIZE = 10000
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+class Export(NamedTuple):
+    name: str
+    title: str
+    columns: dict  # column -> "str", "int" or "float", in output order
+    sql: str       # selects the columns in that order
+
+
+EXPORTS = [
+    Export("student", "Students", {
+        "StudentID": "str", "Name": "str", "BirthDate": "str", "Sex": "str", "Gender": "str", "Religion": "str",
+        "Address": "str", "Track": "str", "Program": "str", "ContactNumber": "str",
+    }, "SELECT {columns} FROM student ORDER BY StudentID"),
+    Export("academicrecords", "Academic records", {
+        "RecordID": "int", "StudentID": "str", "YearLevel": "int", "Semester": "str",
+        "ScholasticStatus": "str", "ScholarshipStatus": "str",
+    }, "SELECT {columns} FROM academicrecords ORDER BY RecordID"),
+    Export("courseassignment", "Course assignments", {
+        "EnrollID": "int", "StudentID": "str", "CourseCode": "str", "CourseDesc": "str", "Units": "float",
+        "Grade": "str", "FinalGrade": "str", "GradeStatus": "str", "AcademicYear": "str", "YearLevel": "str", "Semester": "str",
+    }, """SELECT ca.EnrollID, ca.StudentID, ca.CourseCode, p.CourseDesc, p.Units, ca.Grade, ca.FinalGrade, ca.GradeStatus,
+        ca.AcademicYear, ca.YearLevel, ca.Semester
+    FROM courseassignment ca
+    LEFT JOIN prospectus p ON ca.CourseCode = p.CourseCode
+    ORDER BY ca.EnrollID"""),
+    Export("gpa", "GPA and CGPA per term", {
+        "StudentID": "str", "YearLevel": "str", "Semester": "str", "Units": "float", "GPA": "float",
+        "CumulativeUnits": "float", "CGPA": "float",
+    }, "SELECT {columns} FROM term_gpa ORDER BY StudentID, TermOrder"),
+]
+
+
+def get_export(name):
+    for export in EXPORTS:
+        if export.name == name:
+            return export
+    raise ValueError(f"Unknown export: {name}")
+
+
+def parquet_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def iter_rows(conn, export, chunk_size=CHUNK_SIZE):
+    # Lists of up to chunk_size row tuples
+    cursor = conn.execute(export.sql.format(columns=", ".join(export.columns)))
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def write_csv(conn, export, file, chunk_size=CHUNK_SIZE):
+    # file: binary file object; written as UTF-8 with a header row
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="", write_through=True)
+    try:
+        writer = csv.writer(text)
+        writer.writerow(export.columns)
+        rows = 0
+        for chunk in iter_rows(conn, export, chunk_size):
+            writer.writerows(chunk)
+            rows += len(chunk)
+    finally:
+        # Leave the caller's file open
+        text.detach()
+    return rows
+
+
+def write_parquet(conn, export, file, chunk_size=CHUNK_SIZE):
+    # One row group per chunk, with column types fixed up front so that a chunk
+    # of NULLs does not change the file's schema
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+    arrow_schema = pa.schema([(column, arrow_types[kind]) for column, kind in export.columns.items()])
+    rows = 0
+    with pq.ParquetWriter(file, arrow_schema) as writer:
+        for chunk in iter_rows(conn, export, chunk_size):
+            columns = zip(*chunk)
+            arrays = [pa.array(values, arrow_type) for values, arrow_type in zip(columns, arrow_schema.types)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=arrow_schema))
+            rows += len(chunk)
+    return rows
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def write(conn, name, fmt, file, chunk_size=CHUNK_SIZE):
+    # Write export `name` to the binary file object; returns the number of rows
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format: {fmt}")
+    return WRITERS[fmt](conn, get_export(name), file, chunk_size)
+
+
+@contextmanager
+def snapshot(conn):
+    # One read transaction, so every table is exported as of the same moment
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+
+
+def export_files(names, fmt, directory, chunk_size=CHUNK_SIZE):
+    # Write each export to <directory>/<name>.<fmt>; each file appears only once
+    # complete. Returns {path: rows}.
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = {}
+    with snapshot(db.get_connection()) as conn:
+        for name in names:
+            path = directory / f"{name}.{fmt}"
+            partial = path.with_name(path.name + ".partial")
+            try:
+                with partial.open("wb") as file:
+                    rows = write(conn, name, fmt, file, chunk_size)
+                os.replace(partial, path)
+            except BaseException:
+                # Do not leave a half-written file behind (disk full, Ctrl+C, ...)
+                partial.unlink(missing_ok=True)
+                raise
+            written[path] = rows
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export registrar tables to CSV or Parquet.")
+    parser.add_argument("exports", nargs="*", metavar="export",
+                        help=f"what to export: {', '.join(export.name for export in EXPORTS)} (default: all)")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="parquet is experimental and needs pyarrow")
+    parser.add_argument("--out", default=".", help="directory to write the files to")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows read and written at a time")
+    parser.add_argument("--db", help="database file (default: SMS_DB_PATH or studentmonitor.db)")
+    args = parser.parse_args(argv)
+
+    names = args.exports or [export.name for export in EXPORTS]
+    for name in names:
+        try:
+            get_export(name)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.format == "parquet" and not parquet_available():
+        parser.error("Parquet export needs pyarrow (pip install pyarrow)")
+    if args.db:
+        db.configure(args.db)
+    schema.bootstrap()
+
+    for path, rows in export_files(names, args.format, args.out, args.chunk_size).items():
+        print(f"{rows:>10} rows  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,36 @@
-import pickle
-from pathlib import Path
-import streamlit as st
+import argparse
+import getpass
+import sys
+
 import streamlit_authenticator as stauth
 
-names = ["Johniel Babiera", "Daisy Polestico"]
-usernames = ["jbabiera","dpolestico"]
-passwords = ["abc123","def123"]
+import auth
+import db
+import schema
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add a login account, or reset its password, in the users table.")
+    parser.add_argument("username")
+    parser.add_argument("name", help="full name shown after logging in")
+    parser.add_argument("--db", help="database file (defaults to SMS_DB_PATH or studentmonitor.db)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.configure(args.db)
+    schema.bootstrap()
+
+    password = getpass.getpass(f"Password for {args.username}: ")
+    if not password or password != getpass.getpass("Repeat the password: "):
+        print("Passwords are empty or do not match; nothing saved.", file=sys.stderr)
+        return 1
 
-# Pass the list of passwords directly to the 
-# Hasher constructor and generate the hashes
-hashed_passwords = stauth.Hasher(passwords).generate()
+    password_hash = stauth.Hasher([password]).generate()[0]
+    with db.transaction() as conn:
+        auth.set_user(conn, args.username, args.name, password_hash)
+    print(f"Saved account {args.username}")
+    return 0
 
-file_path = Path(__file__).parent / "hashed_pw.pkl"
-with file_path.open("wb") as file:
-    pickle.dump(hashed_passwords, file)
 
+if __name__ == "__main__":
+    sys.exit(main())
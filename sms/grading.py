@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+GRADE_OPTIONS = ["  ", "1.00", "1.25", "1.50", "1.75", "2.00", "2.25", "2.50", "2.75", "3.00", "5.00", "INC", "INPROG", "P", "F", "DRP", "W"]
+PASSING_GRADES = ["1.00", "1.25", "1.50", "1.75", "2.00", "2.25", "2.50", "2.75", "3.00", "P"]
+PENDING_GRADES = ["INC", "INPROG"]
+
+
+def _text(values):
+    return pd.Series(values, dtype=object).fillna("").astype(str).str.strip()
+
+
+def normalize_grades(values):
+    # Spreadsheets hand back 1.5 or "1.5"; the database stores "1.50"
+    text = _text(values).str.upper()
+    numbers = pd.to_numeric(text, errors="coerce")
+    return text.mask(numbers.notna(), numbers.map("{:.2f}".format))
+
+
+def grade_status(grades):
+    # Vectorized form of the Grade Report's determineGradeStatus
+    grades = _text(grades)
+    status = np.select(
+        [grades.isin(PASSING_GRADES), grades.isin(PENDING_GRADES), grades == "W", grades == "DRP"],
+        ["Passed", "To be Determined", "Withdrawn", "Dropout"],
+        default="Failed",
+    )
+    return pd.Series(status, index=grades.index, dtype=object)
+
+
+def resolve_grades(grades, final_grades):
+    # INC/INPROG keep the final grade as entered and stay undetermined until
+    # one is given; every other grade is its own final grade.
+    grades = _text(grades)
+    final_grades = _text(final_grades).set_axis(grades.index)
+    pending = grades.isin(PENDING_GRADES)
+    final_grades = final_grades.where(pending, grades)
+    status = grade_status(final_grades).mask(pending & (final_grades == ""), "")
+    return final_grades, status
+
+
+# ---------------------------------------------------------------------------
+# Grade points, GPA and CGPA
+
+YEAR_LEVELS = ["1st", "2nd", "3rd", "4th"]
+SEMESTERS = ["1st Term", "2nd Term", "Summer Term"]
+EXCLUDED_COURSES = ["NST001", "NST002"]
+GRADE_POINTS = {"1.00": 1.00, "1.25": 1.25, "1.50": 1.50, "1.75": 1.75, "2.00": 2.00, "2.25": 2.25, "2.50": 2.50, "2.75": 2.75, "3.00": 3.00, "5.00": 5.00}
+FAILING_POINT = 5.00
+GPA_DECIMALS = 5
+
+
+def grade_points(frame):
+    # Grade point per row, NaN where the row does not count toward GPA:
+    #   numeric grade      -> the final grade if numeric, else the initial grade
+    #   INC / INPROG       -> the final grade once given; INC without one counts as 5.00
+    #   DRP                -> 5.00
+    #   W, P, F, blank     -> excluded, as are the NSTP courses
+    grade_codes, grades = _factorize_grades(frame["Grade"])
+    final_codes, final_grades = _factorize_grades(frame["FinalGrade"])
+    initial = grades.map(GRADE_POINTS).to_numpy(dtype=float)[grade_codes]
+    final = final_grades.map(GRADE_POINTS).to_numpy(dtype=float)[final_codes]
+    pending = grades.isin(PENDING_GRADES).to_numpy()[grade_codes]
+    incomplete = (grades == "INC").to_numpy()[grade_codes]
+    dropped = (grades == "DRP").to_numpy()[grade_codes]
+
+    has_final = ~np.isnan(final)
+    points = np.select(
+        [pending, dropped, ~np.isnan(initial)],
+        [np.where(incomplete & ~has_final, FAILING_POINT, final), FAILING_POINT, np.where(has_final, final, initial)],
+        default=np.nan,
+    )
+    points[frame["CourseCode"].isin(EXCLUDED_COURSES).to_numpy()] = np.nan
+    return pd.Series(points, index=frame.index)
+
+
+def _factorize_grades(values):
+    # Normalize each distinct grade once; rows refer to them by code
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    return codes, normalize_grades(uniques)
+
+
+def _weighted(frame):
+    points = grade_points(frame)
+    units = frame["Units"].astype(float).where(points.notna(), 0.0)
+    return units, (units * points).fillna(0.0)
+
+
+def gpa(frame, by):
+    # Unit-weighted GPA per group: Units, WeightedSum and GPA columns indexed by `by`
+    units, weighted = _weighted(frame)
+    keys = [frame[column] for column in by]
+    totals = pd.DataFrame({"Units": units, "WeightedSum": weighted}).groupby(keys, sort=False).sum()
+    totals["GPA"] = (totals["WeightedSum"] / totals["Units"].where(totals["Units"] > 0)).round(GPA_DECIMALS)
+    return totals
+
+
+def term_order(frame):
+    # Sortable rank of (YearLevel, Semester); unknown labels sort last
+    year = pd.Categorical(frame["YearLevel"], categories=YEAR_LEVELS).codes
+    semester = pd.Categorical(frame["Semester"], categories=SEMESTERS).codes
+    year = np.where(year < 0, len(YEAR_LEVELS), year)
+    semester = np.where(semester < 0, len(SEMESTERS), semester)
+    return year * (len(SEMESTERS) + 1) + semester
+
+
+def term_gpas(frame, by=("StudentID",)):
+    # GPA per term plus the running CGPA across each group's ordered terms.
+    # Returns one row per (*by, YearLevel, Semester) in term order.
+    by = list(by)
+    terms = gpa(frame, by + ["YearLevel", "Semester"]).reset_index()
+    terms["TermOrder"] = term_order(terms)
+    terms = terms.sort_values(by + ["TermOrder", "YearLevel", "Semester"]).reset_index(drop=True)
+    running = terms.groupby(by, sort=False)[["Units", "WeightedSum"]].cumsum()
+    terms["CumulativeUnits"] = running["Units"]
+    terms["CumulativeWeightedSum"] = running["WeightedSum"]
+    terms["CGPA"] = (running["WeightedSum"] / running["Units"].where(running["Units"] > 0)).round(GPA_DECIMALS)
+    return terms.drop(columns="TermOrder")
@@ -0,0 +1,121 @@
+# Cold-start import budget for the app's modules. Each module is imported in a
+# fresh interpreter under `python -X importtime`; the check fails when a module's
+# cumulative import time goes over its budget, or when it pulls in a dependency
+# that must only be loaded at first use.
+#
+#   python import_budget.py
+#   python import_budget.py --repeat 5 --scale 2   # slower machine
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# Cumulative import time budget per module, in milliseconds
+BUDGETS_MS = {
+    "db": 150,
+    "schema": 150,
+    "requisites": 150,
+    "refdata": 150,
+    "course_search": 150,
+    "student_search": 150,
+    "registry": 150,
+    "grading": 1200,
+    "class_records": 1200,
+    "student_import": 1200,
+    "services.students": 1200,
+    "services.prospectus": 1200,
+    "services.enrollment": 1200,
+    "services.grades": 1200,
+    "services.analytics": 1200,
+    "api": 1200,
+    "export": 150,
+    "Home": 1500,
+    "Dashboard": 2500,
+    "Student_Registration": 2500,
+    "Prospectus": 2500,
+    "Course_Assignment": 2500,
+    "Grade_Report": 2500,
+    "Data_Export": 2500,
+    "Main": 2500,
+}
+
+# Code run before the import. Main is the entrypoint script itself: it is timed
+# as a rerun after login, with session state standing in for `streamlit run`'s,
+# against a scratch database.
+SETUP = {
+    "Main": "import streamlit as st; st.session_state = {'authentication_status': True, 'name': 'Budget'}; ",
+}
+
+# Heavy dependencies that pages import inside the function that uses them, by
+# full module name. One that streamlit itself already loads (it imports
+# plotly.graph_objects and plotly.io for st.plotly_chart) costs a page nothing.
+LAZY_MODULES = ["plotly.express", "plotly.graph_objects", "streamlit_pandas_profiling", "streamlit_authenticator"]
+
+
+def import_times(module):
+    # {imported module: cumulative microseconds} for one cold import of `module`
+    with tempfile.TemporaryDirectory() as directory:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SETUP.get(module, "") + f"import {module}"],
+            cwd=HERE, capture_output=True, text=True,
+            env={**os.environ, "SMS_DB_PATH": str(Path(directory) / "budget.db")},
+        )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def preloaded():
+    # Lazy modules that `import streamlit` loads on its own, with the installed versions
+    try:
+        return set(import_times("streamlit")) & set(LAZY_MODULES)
+    except ImportError:
+        return set()
+
+
+def check(module, budget_ms, repeat=3, allowed=()):
+    # (milliseconds, problems) for the fastest of `repeat` cold imports
+    runs = [import_times(module) for _ in range(repeat)]
+    # A setup that imports streamlit takes it out of the module's own figure; add it back
+    elapsed = min(run[module] + (run.get("streamlit", 0) if module in SETUP else 0) for run in runs) / 1000
+    problems = []
+    if elapsed > budget_ms:
+        problems.append(f"{elapsed:.0f} ms is over the {budget_ms:.0f} ms budget")
+    for name in LAZY_MODULES:
+        if name in runs[0] and name not in allowed:
+            problems.append(f"imports {name} at module level")
+    return elapsed, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold-start import times against their budgets.")
+    parser.add_argument("modules", nargs="*", help="modules to check (default: all budgeted modules)")
+    parser.add_argument("--repeat", type=int, default=3, help="cold imports per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, e.g. on slow CI machines")
+    args = parser.parse_args(argv)
+
+    allowed = preloaded()
+    failed = False
+    for module in args.modules or BUDGETS_MS:
+        budget_ms = BUDGETS_MS.get(module, max(BUDGETS_MS.values())) * args.scale
+        try:
+            elapsed, problems = check(module, budget_ms, args.repeat, allowed)
+        except ImportError as e:
+            elapsed, problems = float("nan"), [f"failed to import: {e}"]
+        failed = failed or bool(problems)
+        print(f"{'FAIL' if problems else 'ok':4}  {module:22} {elapsed:8.1f} ms / {budget_ms:.0f} ms  {'; '.join(problems)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import db
+
+
+class Lookup:
+    # ID -> name in display order
+    def __init__(self, rows):
+        self._names = dict(rows)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def name(self, id_, default=None):
+        return self._names.get(id_, default)
+
+
+# Shared by every session and rebuilt only when the table is written to.
+# Requisites are cached the same way by requisites.curriculum_graph().
+@db.cached_by_version("prospectus")
+def courses():
+    return Lookup(db.get_connection().execute("SELECT CourseCode, CourseDesc FROM prospectus ORDER BY CourseCode").fetchall())
@@ -0,0 +1,42 @@
+import importlib
+from typing import NamedTuple
+
+
+class Page(NamedTuple):
+    title: str   # menu entry
+    icon: str    # Bootstrap icon name, as option_menu expects
+    module: str  # module with an app() function, imported on first navigation
+
+    def load(self):
+        return importlib.import_module(self.module)
+
+
+PAGES = []
+
+
+def register(title, icon, module):
+    # Adding a page only adds a menu entry; its module is not imported until opened
+    PAGES.append(Page(title, icon, module))
+
+
+register("Home", "house-fill", "Home")
+register("Dashboard", "stack", "Dashboard")
+register("Student Registration", "person-lines-fill", "Student_Registration")
+register("Prospectus", "book-fill", "Prospectus")
+register("Course Assignment", "list-columns-reverse", "Course_Assignment")
+register("Grade Report", "bar-chart-line-fill", "Grade_Report")
+register("Export", "download", "Data_Export")
+
+
+def titles():
+    return [page.title for page in PAGES]
+
+
+def icons():
+    return [page.icon for page in PAGES]
+
+
+def show(title):
+    # Import the page module if this is its first visit, then render it
+    page = next(page for page in PAGES if page.title == title)
+    page.load().app()
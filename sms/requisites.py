@@ -0,0 +1,126 @@
+import json
+from collections import defaultdict
+from typing import NamedTuple
+
+import db
+
+
+class RequisiteCheck(NamedTuple):
+    student_id: str
+    course_code: str
+    missing_prerequisites: list  # prerequisites the student has not taken
+    missing_corequisites: list   # corequisites, when none of them is selected alongside
+
+    @property
+    def ok(self):
+        return not self.missing_prerequisites and not self.missing_corequisites
+
+
+class CurriculumGraph:
+    # Prerequisite DAG of the curriculum. Transitive closures are computed once
+    # at build time so every lookup afterwards is a dictionary access.
+    def __init__(self, edges):
+        self._prerequisites = defaultdict(set)
+        self._corequisites = defaultdict(set)
+        self._dependents = defaultdict(set)
+        for course_code, requires, kind in edges:
+            if kind == "pre":
+                self._prerequisites[course_code].add(requires)
+                self._dependents[requires].add(course_code)
+            else:
+                self._corequisites[course_code].add(requires)
+        courses = set(self._prerequisites) | set(self._dependents)
+        self._all_prerequisites = {code: self._reach(code, self._prerequisites) for code in courses}
+        self._all_dependents = {code: self._reach(code, self._dependents) for code in courses}
+
+    @staticmethod
+    def _reach(start, adjacency):
+        seen = set()
+        stack = list(adjacency.get(start, ()))
+        while stack:
+            code = stack.pop()
+            if code not in seen:
+                seen.add(code)
+                stack.extend(adjacency.get(code, ()))
+        return frozenset(seen)
+
+    def prerequisites(self, course_code):
+        return frozenset(self._prerequisites.get(course_code, ()))
+
+    def corequisites(self, course_code):
+        return frozenset(self._corequisites.get(course_code, ()))
+
+    def dependents(self, course_code):
+        return frozenset(self._dependents.get(course_code, ()))
+
+    def all_prerequisites(self, course_code):
+        # Everything that must be passed before course_code
+        return self._all_prerequisites.get(course_code, frozenset())
+
+    def all_dependents(self, course_code):
+        return self._all_dependents.get(course_code, frozenset())
+
+    def cycles(self):
+        # Courses that are (indirectly) their own prerequisite, grouped per cycle
+        cyclic = {code for code, reach in self._all_prerequisites.items() if code in reach}
+        groups = []
+        while cyclic:
+            code = cyclic.pop()
+            group = {code} | (self._all_prerequisites[code] & self._all_dependents[code])
+            cyclic -= group
+            groups.append(sorted(group))
+        return groups
+
+
+@db.cached_by_version("requisite_edge")
+def curriculum_graph():
+    edges = db.get_connection().execute("SELECT CourseCode, Requires, Kind FROM requisite_edge").fetchall()
+    return CurriculumGraph(edges)
+
+
+def set_requisites(conn, course_code, prerequisites, corequisites):
+    # Replace a course's requisite edges; the legacy comma-joined row is kept in step
+    conn.execute("DELETE FROM requisite_edge WHERE CourseCode = ?", (course_code,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO requisite_edge (CourseCode, Requires, Kind) VALUES (?, ?, ?)",
+        [(course_code, code, "pre") for code in prerequisites] + [(course_code, code, "co") for code in corequisites]
+    )
+    conn.execute("DELETE FROM requisite WHERE CourseCode = ?", (course_code,))
+    conn.execute(
+        "INSERT INTO requisite (CourseCode, Prerequisite, Corequisite) VALUES (?, ?, ?)",
+        (course_code, ", ".join(prerequisites), ", ".join(corequisites))
+    )
+
+
+def fetch_taken_courses(conn, student_ids):
+    # {StudentID: set of CourseCodes with a course assignment} in one query
+    taken = {student_id: set() for student_id in student_ids}
+    rows = conn.execute(
+        "SELECT StudentID, CourseCode FROM courseassignment WHERE StudentID IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(taken)),)
+    ).fetchall()
+    for student_id, course_code in rows:
+        taken[student_id].add(course_code)
+    return taken
+
+
+def check_requisites(conn, selections):
+    # selections: {StudentID: [CourseCode, ...]} -> {StudentID: [RequisiteCheck, ...]}
+    graph = curriculum_graph()
+    taken = fetch_taken_courses(conn, selections)
+
+    results = {}
+    for student_id, course_codes in selections.items():
+        selected = set(course_codes)
+        checks = []
+        for course_code in course_codes:
+            corequisites = graph.corequisites(course_code)
+            missing_prerequisites = sorted(graph.prerequisites(course_code) - taken[student_id])
+            missing_corequisites = sorted(corequisites) if corequisites and selected.isdisjoint(corequisites) else []
+            checks.append(RequisiteCheck(student_id, course_code, missing_prerequisites, missing_corequisites))
+        results[student_id] = checks
+    return results
+
+
+def check_student_requisites(conn, student_id, course_codes):
+    return check_requisites(conn, {student_id: list(course_codes)})[student_id]
@@ -0,0 +1,419 @@
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+
+import db
+
+# Each entry upgrades the database by one version; PRAGMA user_version records
+# how many have been applied. Only ever append to this list.
+MIGRATIONS = [
+    # 1: base tables and indexes for the hot join/filter columns
+    """
+    CREATE TABLE IF NOT EXISTS student (
+        StudentID TEXT NOT NULL UNIQUE,
+        Name TEXT NOT NULL,
+        BirthDate TEXT NOT NULL,
+        Sex TEXT NOT NULL,
+        Gender TEXT NOT NULL,
+        Religion TEXT NOT NULL,
+        Address TEXT NOT NULL,
+        Track TEXT NOT NULL,
+        Program TEXT NOT NULL,
+        ContactNumber TEXT NOT NULL,
+        PRIMARY KEY(StudentID));
+
+    CREATE TABLE IF NOT EXISTS academicrecords (
+        RecordID INTEGER PRIMARY KEY AUTOINCREMENT,
+        StudentID TEXT NOT NULL,
+        ScholasticStatus TEXT NOT NULL,
+        ScholarshipStatus TEXT,
+        YearLevel INTEGER NOT NULL,
+        Semester TEXT NOT NULL,
+        UNIQUE(StudentID, YearLevel, Semester),
+        FOREIGN KEY(StudentID) REFERENCES student(StudentID));
+
+    CREATE TABLE IF NOT EXISTS prospectus (
+        CourseCode TEXT NOT NULL UNIQUE,
+        CourseDesc TEXT NOT NULL,
+        Units INTEGER NOT NULL,
+        Semester TEXT NOT NULL,
+        YearLevel TEXT NOT NULL,
+        Classification TEXT NOT NULL,
+        PRIMARY KEY(CourseCode));
+
+    CREATE TABLE IF NOT EXISTS requisite (
+        CourseCode TEXT,
+        Corequisite TEXT,
+        Prerequisite TEXT,
+        FOREIGN KEY(CourseCode) REFERENCES prospectus(CourseCode));
+
+    CREATE TABLE IF NOT EXISTS courseassignment (
+        EnrollID INTEGER PRIMARY KEY AUTOINCREMENT,
+        StudentID TEXT NOT NULL,
+        CourseCode TEXT NOT NULL,
+        Grade TEXT,
+        FinalGrade TEXT,
+        GradeStatus TEXT,
+        AcademicYear TEXT,
+        YearLevel TEXT,
+        Semester TEXT,
+        FOREIGN KEY(StudentID) REFERENCES student(StudentID),
+        FOREIGN KEY(CourseCode) REFERENCES prospectus(CourseCode));
+
+    CREATE INDEX IF NOT EXISTS idx_courseassignment_student_course
+        ON courseassignment(StudentID, CourseCode);
+    CREATE INDEX IF NOT EXISTS idx_courseassignment_term_student
+        ON courseassignment(YearLevel, Semester, StudentID);
+    CREATE INDEX IF NOT EXISTS idx_courseassignment_course
+        ON courseassignment(CourseCode);
+    CREATE INDEX IF NOT EXISTS idx_academicrecords_term
+        ON academicrecords(YearLevel, Semester);
+    CREATE INDEX IF NOT EXISTS idx_requisite_course
+        ON requisite(CourseCode);
+    CREATE INDEX IF NOT EXISTS idx_prospectus_term
+        ON prospectus(YearLevel, Semester);
+    """,
+    # 2: per-table write counters, see db.table_version()
+    lambda conn: _create_table_versions(conn, ["student", "academicrecords", "prospectus", "requisite", "courseassignment"]),
+    # 3: requisites as one (course, requires, kind) edge per row
+    lambda conn: _create_requisite_edges(conn),
+    # 4: per-student, per-term GPA summary kept current by triggers
+    lambda conn: _create_term_gpa(conn),
+    # 5: full-text index for the Prospectus search, see course_search
+    lambda conn: _create_prospectus_fts(conn),
+    # 6: last-name sort key and trigram index for the student search, see student_search
+    lambda conn: _create_student_search(conn),
+    # 7: login accounts, see auth
+    lambda conn: _create_users(conn),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def _create_table_versions(conn, tables):
+    # Triggers bump a counter on every write so caches can tell when a table
+    # changed, including writes from other connections and processes.
+    conn.execute("""CREATE TABLE IF NOT EXISTS table_version (
+        TableName TEXT PRIMARY KEY,
+        Version INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID""")
+    for table in tables:
+        conn.execute("INSERT OR IGNORE INTO table_version (TableName) VALUES (?)", (table,))
+        for event in ["INSERT", "UPDATE", "DELETE"]:
+            conn.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_version SET Version = Version + 1 WHERE TableName = '{table}';
+                END""")
+
+
+def _create_requisite_edges(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS requisite_edge (
+        CourseCode TEXT NOT NULL,
+        Requires TEXT NOT NULL,
+        Kind TEXT NOT NULL CHECK(Kind IN ('pre', 'co')),
+        PRIMARY KEY(CourseCode, Requires, Kind),
+        FOREIGN KEY(CourseCode) REFERENCES prospectus(CourseCode)) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requisite_edge_requires ON requisite_edge(Requires, Kind)")
+    _create_table_versions(conn, ["requisite_edge"])
+
+    # Older rows may name courses by description instead of code
+    code_for = dict(conn.execute("SELECT CourseDesc, CourseCode FROM prospectus").fetchall())
+    edges = set()
+    for course_code, prerequisite, corequisite in conn.execute("SELECT CourseCode, Prerequisite, Corequisite FROM requisite").fetchall():
+        for kind, value in [("pre", prerequisite), ("co", corequisite)]:
+            for requires in (value or "").split(","):
+                requires = requires.strip()
+                if course_code and requires:
+                    edges.add((course_code, code_for.get(requires, requires), kind))
+    conn.executemany("INSERT OR IGNORE INTO requisite_edge (CourseCode, Requires, Kind) VALUES (?, ?, ?)", sorted(edges))
+
+_bootstrapped = False
+_lock = threading.Lock()
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _statements(script):
+    # Split a script into statements; complete_statement keeps trigger bodies whole
+    pending = ""
+    for chunk in script.split(";"):
+        pending += chunk + ";"
+        if sqlite3.complete_statement(pending):
+            if pending.strip(" \n;"):
+                yield pending.strip()
+            pending = ""
+
+
+def migrate(conn, target=SCHEMA_VERSION):
+    # Apply every migration newer than the database up to `target`, each in its
+    # own transaction. Bulk loaders stop early, insert, then finish, so summary
+    # tables are backfilled in one pass rather than maintained row by row.
+    version = current_version(conn)
+    for number, migration in enumerate(MIGRATIONS[version:target], start=version + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if current_version(conn) >= number:
+                conn.rollback()
+                continue
+            if callable(migration):
+                migration(conn)
+            else:
+                for statement in _statements(migration):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    return current_version(conn)
+
+
+def bootstrap():
+    # Bring the configured database up to date once per process
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _lock:
+        if not _bootstrapped:
+            conn = db.get_connection()
+            migrate(conn)
+            sync_term_gpa_rules(conn)
+            _bootstrapped = True
+
+
+def reset():
+    # Forget that bootstrap ran, e.g. after db.configure() points at a new file
+    global _bootstrapped
+    with _lock:
+        _bootstrapped = False
+
+
+
+def _sql_list(values):
+    return ", ".join(f"'{value}'" for value in values)
+
+
+def _grade_point_sql():
+    # SQL twin of grading.grade_points(); keep the two in step.
+    # grading (and with it pandas) is only imported when trigger SQL is built,
+    # which bootstrap does once per process to check the triggers are current,
+    # so importing schema stays cheap.
+    import grading
+
+    def normalized(column):
+        # Same as grading.normalize_grades: numbers to two decimals, text upper-cased
+        text = f"trim({column})"
+        return (f"(CASE WHEN {text} GLOB '*[0-9]*' AND NOT {text} GLOB '*[^0-9.]*'"
+                f" THEN printf('%.2f', CAST({text} AS REAL)) ELSE upper({text}) END)")
+
+    def points(column):
+        cases = " ".join(f"WHEN '{grade}' THEN {point}" for grade, point in grading.GRADE_POINTS.items())
+        return f"(CASE {normalized(column)} {cases} END)"
+
+    grade = normalized("ca.Grade")
+    initial, final = points("ca.Grade"), points("ca.FinalGrade")
+    return f"""CASE
+        WHEN ca.CourseCode IN ({_sql_list(grading.EXCLUDED_COURSES)}) THEN NULL
+        WHEN {grade} IN ({_sql_list(grading.PENDING_GRADES)}) THEN coalesce({final}, CASE WHEN {grade} = 'INC' THEN {grading.FAILING_POINT} END)
+        WHEN {grade} = 'DRP' THEN {grading.FAILING_POINT}
+        WHEN {initial} IS NOT NULL THEN coalesce({final}, {initial})
+    END"""
+
+
+def _term_order_sql():
+    # SQL twin of grading.term_order()
+    import grading
+
+    years = " ".join(f"WHEN '{label}' THEN {index}" for index, label in enumerate(grading.YEAR_LEVELS))
+    semesters = " ".join(f"WHEN '{label}' THEN {index}" for index, label in enumerate(grading.SEMESTERS))
+    return (f"(CASE YearLevel {years} ELSE {len(grading.YEAR_LEVELS)} END) * {len(grading.SEMESTERS) + 1}"
+            f" + (CASE Semester {semesters} ELSE {len(grading.SEMESTERS)} END)")
+
+
+def term_gpa_refresh_sql(students):
+    # Statements that rebuild term_gpa for the students selected by `students`,
+    # an SQL expression over StudentID (e.g. "StudentID = NEW.StudentID").
+    import grading
+
+    return [
+        f"DELETE FROM term_gpa WHERE {students}",
+        f"""INSERT INTO term_gpa (StudentID, YearLevel, Semester, TermOrder, Units, WeightedSum, GPA,
+                CumulativeUnits, CumulativeWeightedSum, CGPA)
+            SELECT StudentID, YearLevel, Semester, TermOrder, Units, WeightedSum,
+                round(WeightedSum / nullif(Units, 0), {grading.GPA_DECIMALS}),
+                sum(Units) OVER running,
+                sum(WeightedSum) OVER running,
+                round(sum(WeightedSum) OVER running / nullif(sum(Units) OVER running, 0), {grading.GPA_DECIMALS})
+            FROM (
+                SELECT StudentID, YearLevel, Semester, {_term_order_sql()} AS TermOrder,
+                    total(CASE WHEN GradePoint IS NOT NULL THEN Units ELSE 0 END) AS Units,
+                    total(GradePoint * Units) AS WeightedSum
+                FROM (
+                    SELECT ca.StudentID, ca.YearLevel, ca.Semester, p.Units, {_grade_point_sql()} AS GradePoint
+                    FROM courseassignment ca
+                    JOIN prospectus p ON ca.CourseCode = p.CourseCode
+                    WHERE ca.{students} AND ca.YearLevel IS NOT NULL AND ca.Semester IS NOT NULL
+                )
+                GROUP BY StudentID, YearLevel, Semester
+            )
+            WINDOW running AS (PARTITION BY StudentID ORDER BY TermOrder, YearLevel, Semester ROWS UNBOUNDED PRECEDING)""",
+    ]
+
+
+def _create_term_gpa(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS term_gpa (
+        StudentID TEXT NOT NULL,
+        YearLevel TEXT NOT NULL,
+        Semester TEXT NOT NULL,
+        TermOrder INTEGER NOT NULL,
+        Units REAL NOT NULL,
+        WeightedSum REAL NOT NULL,
+        GPA REAL,
+        CumulativeUnits REAL NOT NULL,
+        CumulativeWeightedSum REAL NOT NULL,
+        CGPA REAL,
+        PRIMARY KEY(StudentID, YearLevel, Semester)) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_term_gpa_term ON term_gpa(YearLevel, Semester, GPA)")
+
+    _install_term_gpa_triggers(conn, term_gpa_triggers())
+
+
+TERM_GPA_TRIGGERS = {
+    "courseassignment_insert_gpa": ("AFTER INSERT ON courseassignment", "StudentID = NEW.StudentID"),
+    "courseassignment_update_gpa": ("AFTER UPDATE ON courseassignment", "StudentID IN (OLD.StudentID, NEW.StudentID)"),
+    "courseassignment_delete_gpa": ("AFTER DELETE ON courseassignment", "StudentID = OLD.StudentID"),
+    "prospectus_insert_gpa": ("AFTER INSERT ON prospectus", "StudentID IN (SELECT StudentID FROM courseassignment WHERE CourseCode = NEW.CourseCode)"),
+    "prospectus_update_gpa": ("AFTER UPDATE OF CourseCode, Units ON prospectus", "StudentID IN (SELECT StudentID FROM courseassignment WHERE CourseCode IN (OLD.CourseCode, NEW.CourseCode))"),
+    "prospectus_delete_gpa": ("AFTER DELETE ON prospectus", "StudentID IN (SELECT StudentID FROM courseassignment WHERE CourseCode = OLD.CourseCode)"),
+}
+
+
+def term_gpa_triggers():
+    # {trigger name: CREATE TRIGGER statement} for the current grading rules, written
+    # exactly as SQLite keeps it in sqlite_master so the two can be compared
+    triggers = {}
+    for name, (event, students) in TERM_GPA_TRIGGERS.items():
+        body = ";\n".join(term_gpa_refresh_sql(students))
+        triggers[name] = f"CREATE TRIGGER {name} {event} BEGIN {body}; END"
+    return triggers
+
+
+def _install_term_gpa_triggers(conn, triggers):
+    # (Re)create the triggers and recompute term_gpa for everyone with them
+    for name, sql in triggers.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    for statement in term_gpa_refresh_sql("StudentID IN (SELECT StudentID FROM courseassignment)"):
+        conn.execute(statement)
+
+
+def _installed_triggers(conn, names):
+    placeholders = ", ".join("?" * len(names))
+    return dict(conn.execute(f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})", list(names)))
+
+
+def sync_term_gpa_rules(conn):
+    # The term_gpa triggers hold SQL generated from grading's rules when they were
+    # created. If the rules (GRADE_POINTS, EXCLUDED_COURSES, ...) have changed
+    # since, rebuild the triggers and recompute term_gpa, so an existing database
+    # does not go on computing GPAs the old way. Returns whether it rebuilt them.
+    if current_version(conn) < 4:  # migration 4 creates term_gpa
+        return False
+    triggers = term_gpa_triggers()
+    if _installed_triggers(conn, triggers) == triggers:
+        return False
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have rebuilt them while we waited for the lock
+        if _installed_triggers(conn, triggers) == triggers:
+            conn.rollback()
+            return False
+        _install_term_gpa_triggers(conn, triggers)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return True
+
+
+def _create_fts_triggers(conn, table, index, columns):
+    # Keep an external-content FTS5 index in step with its table
+    names = ", ".join(columns)
+    insert = f"""INSERT INTO {index} (rowid, {names})
+        VALUES (NEW.rowid, {", ".join("NEW." + column for column in columns)})"""
+    delete = f"""INSERT INTO {index} ({index}, rowid, {names})
+        VALUES ('delete', OLD.rowid, {", ".join("OLD." + column for column in columns)})"""
+    triggers = {
+        f"{table}_insert_fts": (f"AFTER INSERT ON {table}", [insert]),
+        f"{table}_update_fts": (f"AFTER UPDATE ON {table}", [delete, insert]),
+        f"{table}_delete_fts": (f"AFTER DELETE ON {table}", [delete]),
+    }
+    for name, (event, statements) in triggers.items():
+        body = ";\n".join(statements)
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body}; END")
+
+
+def _create_prospectus_fts(conn):
+    # External-content FTS5 index over the searchable prospectus columns, kept in
+    # step by triggers. Builds without FTS5 keep the LIKE search instead.
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS prospectus_fts USING fts5(
+            CourseCode, CourseDesc, Classification,
+            content='prospectus', content_rowid='rowid', prefix='2 3')""")
+    except sqlite3.OperationalError:
+        return
+
+    _create_fts_triggers(conn, "prospectus", "prospectus_fts", ["CourseCode", "CourseDesc", "Classification"])
+    conn.execute("INSERT INTO prospectus_fts (prospectus_fts) VALUES ('rebuild')")
+
+
+# Last word of the name, the way the pages used to sort students
+LAST_NAME_SQL = "substr(trim(Name), length(rtrim(trim(Name), replace(trim(Name), ' ', ''))) + 1)"
+
+
+def _create_student_search(conn):
+    # SortKey orders students by last name, then full name; being a generated
+    # column it is always current and the index keeps it precomputed.
+    conn.execute(f"""ALTER TABLE student ADD COLUMN SortKey TEXT
+        GENERATED ALWAYS AS (lower({LAST_NAME_SQL}) || ' ' || lower(trim(Name))) VIRTUAL""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_student_sortkey ON student(SortKey)")
+
+    # Trigram index for substring matches on name and ID number (SQLite 3.34+)
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5(
+            StudentID, Name, content='student', content_rowid='rowid', tokenize='trigram')""")
+    except sqlite3.OperationalError:
+        return
+    _create_fts_triggers(conn, "student", "student_fts", ["StudentID", "Name"])
+    conn.execute("INSERT INTO student_fts (student_fts) VALUES ('rebuild')")
+
+
+# Accounts that used to be hard-coded in Main.py, with their bcrypt hashes
+# in the order generate_keys.py pickled them
+LEGACY_USERS = [("jbabiera", "Johniel Babiera"), ("dpolestico", "Daisy Polestico")]
+LEGACY_PASSWORD_FILE = Path(__file__).resolve().parent / "hashed_pw.pkl"
+
+
+def _create_users(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS users (
+        Username TEXT PRIMARY KEY,
+        Name TEXT NOT NULL,
+        PasswordHash TEXT NOT NULL) WITHOUT ROWID""")
+    _create_table_versions(conn, ["users"])
+
+    if LEGACY_PASSWORD_FILE.exists():
+        with LEGACY_PASSWORD_FILE.open("rb") as file:
+            hashed_passwords = pickle.load(file)
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (Username, Name, PasswordHash) VALUES (?, ?, ?)",
+            [(username, name, password_hash) for (username, name), password_hash in zip(LEGACY_USERS, hashed_passwords)]
+        )
+
+
+if __name__ == "__main__":
+    bootstrap()
+    print(f"{db.DB_PATH} is at schema version {current_version(db.get_connection())}")
@@ -0,0 +1,3 @@
+# Operations behind the pages, as plain functions with no Streamlit in them, so
+# they can be imported, cached, benchmarked and served outside the UI. Reads take
+# a connection; writes open their own transaction, as class_records does.
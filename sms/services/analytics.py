@@ -0,0 +1,171 @@
+import itertools
+from typing import NamedTuple
+
+import pandas as pd
+
+import db
+import grading
+
+# Latin honors bands (inclusive) and the GPA line used for the above/below tiles
+HONORS_BANDS = {"RL": (1.00, 1.20), "CL": (1.21, 1.44), "DL": (1.45, 1.75)}
+GPA_THRESHOLD = 2.50
+
+
+class TermMetrics(NamedTuple):
+    student_total: int
+    survival_rate: int
+    failure_rate: int
+    completion_rate: int
+    promotion_rate: int
+    dropout_rate: int
+    avg_gpa: float
+    avg_cgpa: float
+    inc_students: int
+    withdrawn_students: int
+    failing_students: int
+    honors: dict            # band name -> number of students
+    below_threshold: int
+    above_threshold: int
+
+
+def fetch_status_counts(conn):
+    # INC / withdrawn / failing student counts for every term in one grouped query
+    rows = conn.execute("""
+        SELECT YearLevel, Semester,
+            COUNT(DISTINCT CASE WHEN Grade = 'INC' THEN StudentID END),
+            COUNT(DISTINCT CASE WHEN GradeStatus = 'Withdrawn' THEN StudentID END),
+            COUNT(DISTINCT CASE WHEN FinalGrade = '5.00' THEN StudentID END)
+        FROM courseassignment
+        GROUP BY YearLevel, Semester
+    """).fetchall()
+    return {(year, sem): counts for year, sem, *counts in rows}
+
+
+def fetch_year_level_counts(conn):
+    # Students per year level, and those with a resolved final grade, in one grouped query
+    rows = conn.execute("""
+        SELECT YearLevel,
+            COUNT(DISTINCT StudentID),
+            COUNT(DISTINCT CASE WHEN FinalGrade NOT IN ('INC', 'INPROG') THEN StudentID END)
+        FROM courseassignment
+        GROUP BY YearLevel
+    """).fetchall()
+    return {year: counts for year, *counts in rows}
+
+
+def fetch_gpa_summary(conn):
+    # Averages and honors/threshold counts for every term from the term_gpa summary
+    bands = "".join(f", SUM(GPA BETWEEN {low} AND {high})" for low, high in HONORS_BANDS.values())
+    rows = conn.execute(f"""
+        SELECT YearLevel, Semester, AVG(GPA), AVG(CGPA){bands},
+            SUM(GPA < {GPA_THRESHOLD}), SUM(GPA > {GPA_THRESHOLD})
+        FROM term_gpa
+        GROUP BY YearLevel, Semester
+    """).fetchall()
+    return {(year, sem): values for year, sem, *values in rows}
+
+
+def term_rollups(conn):
+    # {(YearLevel, Semester): TermMetrics} for every term, from a fixed handful of queries
+    student_total, dropouts = conn.execute("""
+        SELECT (SELECT COUNT(*) FROM student),
+            (SELECT COUNT(DISTINCT StudentID) FROM courseassignment WHERE GradeStatus = 'Dropout')
+    """).fetchone()
+    status_counts = fetch_status_counts(conn)
+    year_level_counts = fetch_year_level_counts(conn)
+    gpa_summary = fetch_gpa_summary(conn)
+
+    # Promotion counts the students who reached the next year level
+    next_year = dict(zip(grading.YEAR_LEVELS, grading.YEAR_LEVELS[1:]))
+    no_gpa = (None, None) + (0,) * (len(HONORS_BANDS) + 2)
+
+    # Every year level x semester the Dashboard offers, not just the pairs with
+    # enrollments: the year level and whole-school tiles do not depend on the semester
+    terms = set(status_counts) | set(gpa_summary)
+    year_levels = {year for year, _ in terms} | set(year_level_counts)
+    semesters = {sem for _, sem in terms}
+
+    rollups = {}
+    for year, sem in itertools.product(year_levels, semesters):
+        survival, completion = year_level_counts.get(year, (0, 0))
+        promotion = year_level_counts.get(next_year.get(year), (0, 0))[0]
+        inc, withdrawn, failing = status_counts.get((year, sem), (0, 0, 0))
+        avg_gpa, avg_cgpa, *counts = gpa_summary.get((year, sem), no_gpa)
+        counts = [count or 0 for count in counts]
+        rollups[(year, sem)] = TermMetrics(
+            student_total=student_total,
+            survival_rate=survival,
+            failure_rate=100 - survival,
+            completion_rate=completion,
+            promotion_rate=promotion,
+            dropout_rate=dropouts,
+            avg_gpa=avg_gpa,
+            avg_cgpa=avg_cgpa,
+            inc_students=inc,
+            withdrawn_students=withdrawn,
+            failing_students=failing,
+            honors=dict(zip(HONORS_BANDS, counts)),
+            below_threshold=counts[-2],
+            above_threshold=counts[-1],
+        )
+    return rollups
+
+
+RATE_COUNTS = {
+    "survival_rate": "year_level_students",
+    "completion_rate": "completed_students",
+    "promotion_rate": "next_year_students",
+    "dropout_rate": "dropout_students",
+}
+
+
+def rollup_table(rollups):
+    # Cross-term comparison: one row per term, in term order
+    table = pd.DataFrame(
+        [{"YearLevel": year, "Semester": sem, **metrics._asdict()} for (year, sem), metrics in rollups.items()],
+        columns=["YearLevel", "Semester", *TermMetrics._fields],
+    )
+    honors = pd.DataFrame(table.pop("honors").tolist(), columns=list(HONORS_BANDS), index=table.index)
+    # The Dashboard's "rates" are student counts (its failure rate is 100 minus
+    # a count); here they are named for what they hold, and the failure rate is left out
+    table = table.drop(columns=["student_total", "failure_rate"]).rename(columns=RATE_COUNTS)
+    table = pd.concat([table, honors], axis=1)
+    table["TermOrder"] = grading.term_order(table)
+    return table.sort_values(["TermOrder", "YearLevel", "Semester"]).drop(columns="TermOrder").reset_index(drop=True)
+
+
+def term_gpas(conn, year_level, semester):
+    # GPA and CGPA (through this term) of every student enrolled in the term,
+    # read from the trigger-maintained term_gpa summary
+    return pd.read_sql_query(
+        "SELECT StudentID, GPA, CGPA FROM term_gpa WHERE YearLevel = ? AND Semester = ?",
+        conn, params=(year_level, semester)
+    ).set_index('StudentID')
+
+
+# Rollups for every term are built together and dropped automatically whenever
+# any of these tables is written to, from this session or any other.
+@db.cached_by_version("student", "courseassignment", "prospectus")
+def dashboard_rollups():
+    return term_rollups(db.get_connection())
+
+
+def dashboard_metrics(year_level, semester):
+    rollups = dashboard_rollups()
+    if (year_level, semester) in rollups:
+        return rollups[(year_level, semester)]
+    # term_rollups covers every year level x semester on record, so only labels
+    # with no enrollments at all get here; the whole-school tiles still apply
+    empty = TermMetrics(0, 0, 100, 0, 0, 0, None, None, 0, 0, 0, dict.fromkeys(HONORS_BANDS, 0), 0, 0)
+    if rollups:
+        known = next(iter(rollups.values()))
+        empty = empty._replace(student_total=known.student_total, dropout_rate=known.dropout_rate)
+    return empty
+
+
+@db.cached_by_version("courseassignment")
+def dashboard_terms():
+    conn = db.get_connection()
+    semesters = [row[0] for row in conn.execute("SELECT DISTINCT Semester FROM courseassignment")]
+    year_levels = [row[0] for row in conn.execute("SELECT DISTINCT YearLevel FROM courseassignment")]
+    return semesters, year_levels
@@ -0,0 +1,89 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+import db
+import requisites
+
+
+class AssignmentResult(NamedTuple):
+    assigned: list  # CourseCodes newly assigned
+    checks: list    # RequisiteCheck per selected course, including the ones that failed
+
+
+def _add_assignment(conn, student_id, course_code, academic_year, year_level, semester):
+    exists = conn.execute(
+        "SELECT 1 FROM courseassignment WHERE StudentID = ? AND CourseCode = ? AND AcademicYear = ? AND YearLevel = ? AND Semester = ?",
+        (student_id, course_code, academic_year, year_level, semester)
+    ).fetchone()
+    if exists:
+        return False
+    conn.execute(
+        "INSERT INTO courseassignment (StudentID, CourseCode, AcademicYear, YearLevel, Semester) VALUES (?, ?, ?, ?, ?)",
+        (student_id, course_code, academic_year, year_level, semester)
+    )
+    return True
+
+
+def assign_courses(student_id, course_codes, academic_year, year_level, semester):
+    # Enroll the student in every selected course whose prerequisites are taken and
+    # whose corequisites are taken or selected too; courses already assigned for the
+    # term are skipped. All prerequisite lookups are one query.
+    assigned = []
+    with db.transaction() as conn:
+        checks = requisites.check_student_requisites(conn, student_id, course_codes)
+        for check in checks:
+            if check.ok and _add_assignment(conn, student_id, check.course_code, academic_year, year_level, semester):
+                assigned.append(check.course_code)
+    return AssignmentResult(assigned, checks)
+
+
+def update_assignment(student_id, course_code, year_level, semester):
+    with db.transaction() as conn:
+        conn.execute(
+            "UPDATE courseassignment SET YearLevel = ?, Semester = ? WHERE StudentID = ? AND CourseCode = ?",
+            (year_level, semester, student_id, course_code)
+        )
+
+
+def delete_assignment(student_id, course_code):
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM courseassignment WHERE StudentID = ? AND CourseCode = ?", (student_id, course_code))
+
+
+def student_assignments(conn, student_id):
+    # The student's assignments with course descriptions, latest year level first;
+    # courses since removed from the prospectus are kept with a blank description
+    return pd.read_sql_query(
+        """SELECT ca.StudentID, ca.CourseCode, p.CourseDesc, ca.Semester, ca.YearLevel, ca.AcademicYear
+        FROM courseassignment ca
+        LEFT JOIN prospectus p ON ca.CourseCode = p.CourseCode
+        WHERE ca.StudentID = ?
+        ORDER BY ca.YearLevel DESC, ca.Semester""", conn, params=(student_id,)
+    )
+
+
+def student_courses(conn, student_id):
+    # The student's courses with their units, for unit totals and the term tables
+    return pd.read_sql_query(
+        """SELECT ca.StudentID, ca.CourseCode, p.CourseDesc, ca.Semester, ca.YearLevel, p.Units
+        FROM courseassignment ca
+        JOIN prospectus p ON ca.CourseCode = p.CourseCode
+        WHERE ca.StudentID = ?
+        ORDER BY ca.YearLevel DESC, ca.Semester DESC""", conn, params=(student_id,)
+    )
+
+
+def curriculum_units(conn):
+    # Units of every course in the prospectus
+    return conn.execute("SELECT COALESCE(SUM(Units), 0) FROM prospectus").fetchone()[0]
+
+
+def course_counts(conn):
+    # Assignments per course for each academic year and semester
+    return pd.read_sql_query(
+        """SELECT AcademicYear, Semester, CourseCode, COUNT(*) AS Count
+        FROM courseassignment
+        WHERE AcademicYear IS NOT NULL
+        GROUP BY AcademicYear, Semester, CourseCode""", conn
+    )
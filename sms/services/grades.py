@@ -0,0 +1,85 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+import class_records
+import db
+import grading
+
+GRADE_COLUMNS = ['Grade', 'FinalGrade']
+
+
+class TermGrades(NamedTuple):
+    year_level: str
+    semester: str
+    grades: pd.DataFrame  # EnrollID, StudentID, CourseCode, CourseDesc, Grade, FinalGrade, GradeStatus, Units
+    gpa: float
+    cgpa: float           # through this term
+
+
+def student_grades(conn, student_id):
+    return pd.read_sql_query(
+        """SELECT ca.EnrollID, ca.StudentID, ca.CourseCode, p.CourseDesc, ca.Grade, ca.FinalGrade, ca.GradeStatus, p.Units, ca.Semester, ca.YearLevel
+        FROM courseassignment ca
+        JOIN prospectus p ON ca.CourseCode = p.CourseCode
+        WHERE ca.StudentID = ?
+        ORDER BY ca.YearLevel, ca.Semester""",
+        conn, params=(student_id,)
+    )
+
+
+def term_results(conn, student_id):
+    # GPA and running CGPA per term, kept current by the term_gpa triggers
+    results = pd.read_sql_query(
+        "SELECT YearLevel, Semester, GPA, CGPA FROM term_gpa WHERE StudentID = ? ORDER BY TermOrder",
+        conn, params=(student_id,)
+    ).set_index(['YearLevel', 'Semester'])
+    # A column that is all NULL comes back as object; filling that would downcast
+    return results.astype(float).fillna(0)
+
+
+def evaluation(conn, student_id):
+    # The student's grades split by term, in term order, each with its GPA and CGPA.
+    # Grade rows keep their index so edits can be diffed against them.
+    grades = student_grades(conn, student_id)
+    results = term_results(conn, student_id)
+    by_term = grades.groupby(['YearLevel', 'Semester'])
+    terms = []
+    for year in grading.YEAR_LEVELS:
+        for sem in grading.SEMESTERS:
+            if (year, sem) not in by_term.groups:
+                continue
+            gpa, cgpa = results.loc[(year, sem)] if (year, sem) in results.index else (0, 0)
+            terms.append(TermGrades(year, sem, by_term.get_group((year, sem)).drop(columns=['Semester', 'YearLevel']), gpa, cgpa))
+    return terms
+
+
+def save_grade_changes(original, edited):
+    # Save only the rows whose grades were edited, in one transaction; returns how many
+    before = original[GRADE_COLUMNS].fillna("").astype(str).apply(lambda column: column.str.strip())
+    after = edited[GRADE_COLUMNS].fillna("").astype(str).apply(lambda column: column.str.strip())
+    changed = edited[(before != after).any(axis=1)].copy()
+    if changed.empty:
+        return 0
+
+    changed['FinalGrade'], changed['GradeStatus'] = grading.resolve_grades(changed['Grade'], changed['FinalGrade'])
+    with db.transaction() as conn:
+        class_records.update_grades(conn, changed[['Grade', 'FinalGrade', 'GradeStatus', 'EnrollID']])
+    return len(changed)
+
+
+def course_status_counts(conn, year_level, semester):
+    # Per course of the term: how many students passed, failed, dropped, withdrew or must retake
+    return pd.read_sql_query(
+        """SELECT p.CourseCode, p.CourseDesc, p.Units, ca.Semester, ca.YearLevel,
+        SUM(CASE WHEN ca.GradeStatus = 'Passed' THEN 1 ELSE 0 END) as PassedCount,
+        SUM(CASE WHEN ca.GradeStatus = 'Failed' THEN 1 ELSE 0 END) as FailedCount,
+        SUM(CASE WHEN ca.GradeStatus = 'Dropout' THEN 1 ELSE 0 END) as DroppedCount,
+        SUM(CASE WHEN ca.GradeStatus = 'Withdrawn' THEN 1 ELSE 0 END) as WithdrawnCount,
+        SUM(CASE WHEN ca.GradeStatus != 'Passed' THEN 1 ELSE 0 END) as RetakeCount
+        FROM prospectus p
+        LEFT JOIN courseassignment ca ON p.CourseCode = ca.CourseCode
+        WHERE ca.YearLevel LIKE ? AND ca.Semester LIKE ?
+        GROUP BY p.CourseCode, p.CourseDesc, p.Units, ca.Semester, ca.YearLevel""",
+        conn, params=(f'%{year_level}%', f'%{semester}%')
+    )
@@ -0,0 +1,91 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+import course_search
+import db
+import requisites
+
+# Prospectus labels, which differ from the course assignment ones in grading
+YEAR_LEVELS = ["1", "2", "3", "4"]
+SEMESTERS = ["1st Sem", "2nd Sem", "Summer"]
+
+# PrereqCode and CoreqCode columns for prospectus row `p`: its requisites as sorted, comma-separated codes
+REQUISITE_CODES_SQL = """
+    COALESCE((SELECT GROUP_CONCAT(Requires, ', ') FROM (SELECT Requires FROM requisite_edge
+              WHERE CourseCode = p.CourseCode AND Kind = 'pre' ORDER BY Requires)), '') AS PrereqCode,
+    COALESCE((SELECT GROUP_CONCAT(Requires, ', ') FROM (SELECT Requires FROM requisite_edge
+              WHERE CourseCode = p.CourseCode AND Kind = 'co' ORDER BY Requires)), '') AS CoreqCode"""
+
+
+class Course(NamedTuple):
+    CourseCode: str
+    CourseDesc: str
+    Units: float
+    Semester: str
+    YearLevel: str
+    Classification: str
+
+
+def get_course(conn, course_code):
+    row = conn.execute(f"SELECT {', '.join(Course._fields)} FROM prospectus WHERE CourseCode = ?", (course_code,)).fetchone()
+    return Course(*row) if row else None
+
+
+def _exists(conn, course_code):
+    return conn.execute("SELECT 1 FROM prospectus WHERE CourseCode = ?", (course_code,)).fetchone() is not None
+
+
+def add_course(course):
+    # False when the course code is already in the prospectus
+    with db.transaction() as conn:
+        if _exists(conn, course.CourseCode):
+            return False
+        conn.execute(
+            f"INSERT INTO prospectus ({', '.join(Course._fields)}) VALUES ({', '.join('?' * len(Course._fields))})", course
+        )
+    return True
+
+
+def update_course(course):
+    # False when the course code is not in the prospectus
+    with db.transaction() as conn:
+        return conn.execute(
+            "UPDATE prospectus SET CourseDesc=?, Units=?, Semester=?, YearLevel=?, Classification=? WHERE CourseCode=?",
+            course[1:] + course[:1]
+        ).rowcount > 0
+
+
+def delete_course(course_code):
+    with db.transaction() as conn:
+        return conn.execute("DELETE FROM prospectus WHERE CourseCode = ?", (course_code,)).rowcount > 0
+
+
+def update_requisites(course_code, prerequisites, corequisites):
+    # Replace the course's requisites; returns the prerequisite cycles this leaves
+    with db.transaction() as conn:
+        requisites.set_requisites(conn, course_code, prerequisites, corequisites)
+    return requisites.curriculum_graph().cycles()
+
+
+def listing(conn, search_query=""):
+    # Every matching course with its requisite codes in one round trip, best
+    # search match first; see course_search for how terms are matched
+    matches, params = course_search.matches_sql(conn, search_query)
+    query = f"""
+    WITH matches AS ({matches})
+    SELECT p.CourseCode, p.CourseDesc, p.Units, p.Semester, p.YearLevel, p.Classification, {REQUISITE_CODES_SQL}
+    FROM matches m JOIN prospectus p USING (CourseCode)
+    ORDER BY m.Rank"""
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def terms(listing):
+    # ((YearLevel, Semester), courses) in year level then semester order, grouped in
+    # memory; terms with no courses are skipped, as are unknown labels
+    listing = listing.copy()
+    listing['YearLevel'] = pd.Categorical(listing['YearLevel'], categories=YEAR_LEVELS)
+    listing['Semester'] = pd.Categorical(listing['Semester'], categories=SEMESTERS)
+    listing = listing.dropna(subset=['YearLevel', 'Semester']).sort_values(['YearLevel', 'Semester'], kind='stable')
+    for term, courses in listing.groupby(['YearLevel', 'Semester'], observed=True, sort=False):
+        yield term, courses.astype({'YearLevel': object, 'Semester': object})
@@ -0,0 +1,159 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+import db
+
+DIRECTORY_PAGE_SIZE = 50
+
+
+class Student(NamedTuple):
+    StudentID: str
+    Name: str
+    BirthDate: str
+    Sex: str
+    Gender: str
+    Religion: str
+    Address: str  # "Region,Province,City,Barangay"
+    Track: str
+    Program: str
+    ContactNumber: str
+
+
+class AcademicRecord(NamedTuple):
+    StudentID: str
+    YearLevel: int
+    Semester: str
+    ScholasticStatus: str
+    ScholarshipStatus: str
+
+
+def get_student(conn, student_id):
+    row = conn.execute(f"SELECT {', '.join(Student._fields)} FROM student WHERE StudentID = ?", (student_id,)).fetchone()
+    return Student(*row) if row else None
+
+
+def _exists(conn, student_id):
+    return conn.execute("SELECT 1 FROM student WHERE StudentID = ?", (student_id,)).fetchone() is not None
+
+
+def add_student(student):
+    # False when a student with this ID already exists
+    with db.transaction() as conn:
+        if _exists(conn, student.StudentID):
+            return False
+        conn.execute(
+            f"INSERT INTO student ({', '.join(Student._fields)}) VALUES ({', '.join('?' * len(Student._fields))})", student
+        )
+    return True
+
+
+def update_student(student):
+    # False when there is no student with this ID
+    with db.transaction() as conn:
+        if not _exists(conn, student.StudentID):
+            return False
+        conn.execute(
+            "UPDATE student SET Name=?, BirthDate=?, Sex=?, Gender=?, Religion=?, Address=?, Track=?, Program=?, ContactNumber=? WHERE StudentID=?",
+            student[1:] + student[:1]
+        )
+    return True
+
+
+def delete_student(student_id):
+    with db.transaction() as conn:
+        return conn.execute("DELETE FROM student WHERE StudentID = ?", (student_id,)).rowcount > 0
+
+
+def get_academic_record(conn, student_id, year_level, semester):
+    row = conn.execute(
+        f"SELECT {', '.join(AcademicRecord._fields)} FROM academicrecords WHERE StudentID = ? AND YearLevel = ? AND Semester = ?",
+        (student_id, year_level, semester)
+    ).fetchone()
+    return AcademicRecord(*row) if row else None
+
+
+def academic_terms(conn, student_id):
+    # [(YearLevel, Semester)] the student has academic records for
+    return conn.execute(
+        "SELECT DISTINCT YearLevel, Semester FROM academicrecords WHERE StudentID = ? ORDER BY YearLevel, Semester", (student_id,)
+    ).fetchall()
+
+
+def academic_records(conn, student_id):
+    return pd.read_sql_query(
+        """SELECT YearLevel, Semester, ScholasticStatus, ScholarshipStatus
+        FROM academicrecords
+        WHERE StudentID = ?
+        ORDER BY YearLevel, Semester""", conn, params=(student_id,)
+    )
+
+
+def add_academic_record(record):
+    # False when the student already has a record for the term
+    with db.transaction() as conn:
+        if get_academic_record(conn, record.StudentID, record.YearLevel, record.Semester):
+            return False
+        conn.execute(
+            "INSERT INTO academicrecords (StudentID, YearLevel, Semester, ScholasticStatus, ScholarshipStatus) VALUES (?, ?, ?, ?, ?)", record
+        )
+    return True
+
+
+def update_academic_record(record):
+    # False when the student has no record for the term
+    with db.transaction() as conn:
+        return conn.execute(
+            """UPDATE academicrecords SET ScholasticStatus = ?, ScholarshipStatus = ?
+            WHERE StudentID = ? AND YearLevel = ? AND Semester = ?""",
+            (record.ScholasticStatus, record.ScholarshipStatus, record.StudentID, record.YearLevel, record.Semester)
+        ).rowcount > 0
+
+
+def _directory_conditions(filters):
+    # WHERE clause for the Student Directory filters (YearLevel, Semester, Program,
+    # ScholasticStatus); blank filters match everything. The unary + keeps SQLite
+    # reading the term index in page order instead of sorting every row of a year
+    # level when only the semester is filtered.
+    columns = ["ar.YearLevel", "+ar.Semester", "+s.Program", "+ar.ScholasticStatus"]
+    conditions = [f"{column} = ?" for column, value in zip(columns, filters) if value]
+    return " AND ".join(conditions) or "1 = 1", [value for value in filters if value]
+
+
+def directory_page(conn, filters, after=None, page_size=DIRECTORY_PAGE_SIZE):
+    # Up to page_size + 1 academic records in (YearLevel, Semester, RecordID) order,
+    # continuing after the key of the previous page's last row; the extra row tells
+    # the caller there is a next page. This walks the academicrecords term index
+    # and stops after a page's worth of rows.
+    where, params = _directory_conditions(filters)
+    if after:
+        where += " AND (ar.YearLevel, ar.Semester, ar.RecordID) > (?, ?, ?)"
+        params += list(after)
+    return pd.read_sql_query(
+        f"""SELECT ar.RecordID, s.StudentID, s.Name, s.Sex, s.Gender, s.Religion, s.Address, s.Track, s.Program, ar.ScholasticStatus, ar.ScholarshipStatus, s.ContactNumber, ar.Semester, ar.YearLevel
+        FROM academicrecords ar
+        JOIN student s ON ar.StudentID = s.StudentID
+        WHERE {where}
+        ORDER BY ar.YearLevel, ar.Semester, ar.RecordID
+        LIMIT ?""", conn, params=params + [page_size + 1]
+    )
+
+
+def page_key(page):
+    # Key of a directory page's last row, as native values for the next page's query
+    return next(page[["YearLevel", "Semester", "RecordID"]].tail(1).itertuples(index=False, name=None))
+
+
+def directory_counts(conn, filters):
+    # Students per term under the same filters, as {(YearLevel, Semester): count};
+    # student is only joined when filtering by program
+    where, params = _directory_conditions(filters)
+    join = "JOIN student s ON ar.StudentID = s.StudentID" if filters[2] else ""
+    rows = conn.execute(
+        f"""SELECT ar.YearLevel, ar.Semester, COUNT(*)
+        FROM academicrecords ar
+        {join}
+        WHERE {where}
+        GROUP BY ar.YearLevel, ar.Semester""", params
+    ).fetchall()
+    return {(year_level, semester): count for year_level, semester, count in rows}
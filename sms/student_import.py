@@ -0,0 +1,126 @@
+import argparse
+import sys
+from typing import NamedTuple
+
+import pandas as pd
+
+import db
+import schema
+
+STUDENT_COLUMNS = ["StudentID", "Name", "BirthDate", "Sex", "Gender", "Religion", "Address", "Track", "Program", "ContactNumber"]
+ADDRESS_PARTS = ["Region", "Province", "City", "Barangay"]
+ID_PATTERN = r"\d{4}-\d{4}"
+PHONE_PATTERN = r"09\d{9}"
+CHUNK_SIZE = 5000
+
+
+class ImportResult(NamedTuple):
+    inserted: int
+    rejected: pd.DataFrame  # Row (1-based, as in the spreadsheet), StudentID, Reason
+
+
+def read_chunks(source, chunksize=CHUNK_SIZE):
+    # CSV is streamed in chunks; Excel workbooks can only be read whole
+    name = str(getattr(source, "name", source)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        yield pd.read_excel(source, dtype=str, keep_default_na=False)
+    else:
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunksize)
+
+
+def prepare(chunk):
+    chunk = chunk.rename(columns=lambda column: str(column).strip())
+    if "Address" not in chunk.columns and all(part in chunk.columns for part in ADDRESS_PARTS):
+        parts = [chunk[part].fillna("").str.strip() for part in ADDRESS_PARTS]
+        chunk["Address"] = parts[0].str.cat(parts[1:], sep=",")
+    missing = [column for column in STUDENT_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return chunk[STUDENT_COLUMNS].fillna("").apply(lambda column: column.str.strip())
+
+
+def validate(frame, seen_ids):
+    # One reason per row, checked column-wise; earlier checks win
+    reasons = pd.Series("", index=frame.index)
+    checks = [
+        ((frame == "").any(axis=1), "Missing required field"),
+        (~frame["StudentID"].str.fullmatch(ID_PATTERN), "StudentID must be ####-####"),
+        (~frame["ContactNumber"].str.fullmatch(PHONE_PATTERN), "Phone number must be 09#########"),
+        (frame["StudentID"].duplicated() | frame["StudentID"].isin(seen_ids), "Duplicate StudentID in file"),
+    ]
+    for failed, reason in checks:
+        reasons = reasons.mask(failed & (reasons == ""), reason)
+    return reasons
+
+
+def existing_ids(conn, student_ids):
+    # Set-based duplicate check through a temp table instead of one SELECT per row
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS import_ids (StudentID TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.import_ids")
+    conn.executemany("INSERT OR IGNORE INTO temp.import_ids VALUES (?)", ((sid,) for sid in student_ids))
+    rows = conn.execute(
+        "SELECT s.StudentID FROM student s JOIN temp.import_ids i ON s.StudentID = i.StudentID"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def import_students(source, dry_run=False, chunksize=CHUNK_SIZE):
+    inserted = 0
+    rejected = []
+    seen_ids = set()
+    offset = 0
+
+    with db.transaction() as conn:
+        for chunk in read_chunks(source, chunksize):
+            frame = prepare(chunk)
+            frame.index = range(offset + 2, offset + 2 + len(frame))  # header is row 1
+            offset += len(frame)
+
+            reasons = validate(frame, seen_ids)
+            candidates = frame[reasons == ""]
+            taken = existing_ids(conn, candidates["StudentID"])
+            reasons = reasons.mask((reasons == "") & frame["StudentID"].isin(taken), "StudentID already registered")
+
+            valid = frame[reasons == ""]
+            conn.executemany(
+                "INSERT INTO student (StudentID, Name, BirthDate, Sex, Gender, Religion, Address, Track, Program, ContactNumber) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                valid.itertuples(index=False, name=None)
+            )
+            inserted += len(valid)
+            seen_ids.update(frame["StudentID"])
+
+            bad = reasons[reasons != ""]
+            rejected.append(pd.DataFrame({"Row": bad.index, "StudentID": frame.loc[bad.index, "StudentID"], "Reason": bad}))
+
+        conn.execute("DROP TABLE IF EXISTS temp.import_ids")
+        if dry_run:
+            conn.rollback()
+
+    rejected = pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame(columns=["Row", "StudentID", "Reason"])
+    return ImportResult(inserted, rejected)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Register a batch of students from a CSV or Excel file.")
+    parser.add_argument("file", help="CSV/XLSX with columns " + ", ".join(STUDENT_COLUMNS))
+    parser.add_argument("--db", help="database file (defaults to SMS_DB_PATH or studentmonitor.db)")
+    parser.add_argument("--rejects", help="write rejected rows to this CSV file")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, do not write")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.configure(args.db)
+    schema.bootstrap()
+
+    result = import_students(args.file, dry_run=args.dry_run)
+    action = "Validated" if args.dry_run else "Imported"
+    print(f"{action} {result.inserted} student(s), rejected {len(result.rejected)}.")
+    if args.rejects:
+        result.rejected.to_csv(args.rejects, index=False)
+    elif not result.rejected.empty:
+        print(result.rejected.to_string(index=False))
+    return 0 if result.rejected.empty else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
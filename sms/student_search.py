@@ -0,0 +1,47 @@
+import db
+
+SEARCH_LIMIT = 20
+# The trigram index only matches words of at least this many characters
+TRIGRAM_LENGTH = 3
+
+
+def search_students(conn, query, limit=SEARCH_LIMIT):
+    # (StudentID, Name) of up to `limit` students whose name or ID number contains
+    # every word of the query, in last-name order. Longer words go through the
+    # trigram index, shorter ones are checked on the rows it returns.
+    words = query.split()
+    sql = "SELECT s.StudentID, s.Name FROM student s"
+    conditions = []
+    params = []
+
+    indexed = [word for word in words if len(word) >= TRIGRAM_LENGTH]
+    if indexed and db.has_table(conn, "student_fts"):
+        sql += " JOIN student_fts f ON f.rowid = s.rowid"
+        conditions.append("student_fts MATCH ?")
+        params.append(" ".join('"' + word.replace('"', '""') + '"' for word in indexed))
+        words = [word for word in words if len(word) < TRIGRAM_LENGTH]
+
+    for word in words:
+        conditions.append("(s.Name LIKE ? OR s.StudentID LIKE ?)")
+        params += [f"%{word}%"] * 2
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY s.SortKey LIMIT ?"
+    return conn.execute(sql, params + [limit]).fetchall()
+
+
+def student_picker(label, key, allow_blank=False, limit=SEARCH_LIMIT):
+    # Typeahead: a search box and a selectbox of its top matches.
+    # Returns (StudentID, Name), or (None, None) when no student is picked.
+    import streamlit as st
+
+    query = st.text_input(label, key=f"{key}_query", placeholder="Search by name or ID number")
+    matches = dict(search_students(db.get_connection(), query, limit))
+    options = ([""] if allow_blank else []) + list(matches)
+    student_id = st.selectbox(
+        label, options, key=f"{key}_student", label_visibility="collapsed",
+        format_func=lambda student_id: f"{matches[student_id]} ({student_id})" if student_id else "",
+    )
+    if not student_id:
+        return None, None
+    return student_id, matches[student_id]